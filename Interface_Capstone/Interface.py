@@ -1,7 +1,10 @@
 import sys
 import time
 import os
-import time
+import mmap
+import queue
+import struct
+import threading
 from pathlib import Path
 #clean
 
@@ -12,17 +15,15 @@ if str(project_root) not in sys.path:
 
 import numpy as np
 import cv2
-import serial
 import RPi.GPIO as GPIO
-from datetime import datetime
-
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget,
     QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QStatusBar, QMessageBox, QGridLayout,
 )
-from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtGui import QImage, QPixmap
+from PyQt6.QtCore import Qt, QTimer, QEvent, QRect
+from PyQt6.QtGui import QImage, QPixmap, QPixmapCache, QPainter
+from PyQt6 import sip
 
 from xavier.io_utils import capture_and_save_frame
 from xavier.gallery import Gallery, ImageEditorWindow
@@ -36,25 +37,37 @@ from xavier.stepper_Motor import (
     motor1_forward_until_switch2,
     motor1_backward_until_switch1,
     motor3_rotate_45,
-    motor3_home
+    motor3_home,
+    ABORT as motor_abort,
 )
 
-ser = serial.Serial("/dev/ttyACM0", 115200, timeout=0.01)
+# /dev/ttyACM0 is owned by xavier.stepper_Motor (single handle + lock)
 from xavier.camera_picam2 import Picamera2
+from picamera2 import MappedArray
 
 # ⭐ NEW: E-STOP module (final version)
 from xavier import gpio_estop
 
+# libgpiod (v1 bindings) — optional, event-driven tray switches
+try:
+    import gpiod
+except ImportError:
+    gpiod = None
+
 # =====================================================
 # LOGGING SYSTEM
 # =====================================================
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 import os
 
 LOG_DIR = "/home/xray_juanito/Capstone_Xray_Imaging/logs"
 os.makedirs(LOG_DIR, exist_ok=True)
 
+# Single source of truth for where X-ray captures live
+CAPTURE_DIR = Path("/home/xray_juanito/Capstone_Xray_Imaging/captures")
+os.makedirs(CAPTURE_DIR, exist_ok=True)
+
 LOG_FILE = f"{LOG_DIR}/interface_.log"
 
 handler = RotatingFileHandler(
@@ -63,79 +76,398 @@ handler = RotatingFileHandler(
     backupCount=10
 )
 
+handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
+
+# log_event() only enqueues; the listener thread does the formatting and
+# the SD-card writes, so timer callbacks never block on file I/O
+_log_queue = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, handler)
+_log_listener.start()
+
+# Bare message on the queue side — the file handler adds the prefix
 logging.basicConfig(
     level=logging.INFO,
-    handlers=[handler],
-    format="%(asctime)s [%(levelname)s] %(message)s"
+    format="%(message)s",
+    handlers=[QueueHandler(_log_queue)],
 )
 
 def log_event(message):
     logging.info(message)
 
 
+# Preview QImage format, resolved once for the per-frame path
+_GRAY8 = QImage.Format.Format_Grayscale8
+
+# Capture JPEG settings — Huffman optimisation/progressive off: noticeably
+# faster encodes on the Pi for a few % larger files
+JPEG_PARAMS = [
+    cv2.IMWRITE_JPEG_QUALITY, 90,
+    cv2.IMWRITE_JPEG_OPTIMIZE, 0,
+    cv2.IMWRITE_JPEG_PROGRESSIVE, 0,
+]
+
+
+class CaptureWriter(QThread):
+    """Persistent JPEG writer fed by a bounded queue (fire-and-forget saves)."""
+    saved = pyqtSignal(str)  # filename, once it is on disk under its final name
+    BATCH_MAX = 4           # captures per flush
+    BATCH_WINDOW_S = 0.25   # how long to wait for more before flushing
+
+    def __init__(self, maxsize=4, parent=None):
+        super().__init__(parent)
+        self.q = queue.Queue(maxsize=maxsize)
+
+    def put(self, filename, img):
+        try:
+            self.q.put_nowait((filename, img))
+        except queue.Full:
+            log_event("Save queue full — waiting for writer")
+            self.q.put((filename, img))
+
+    def stop(self):
+        self.q.put(None)        # sentinel: finish what is queued, then exit
+
+    def run(self):
+        running = True
+        while running:
+            # Block for one capture, then pick up whatever else arrives
+            # within the batch window (burst of shots → one flush)
+            batch = [self.q.get()]
+            deadline = time.monotonic() + self.BATCH_WINDOW_S
+            while batch[-1] is not None and len(batch) < self.BATCH_MAX:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self.q.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            if batch[-1] is None:
+                batch.pop()
+                running = False
+
+            written = []
+            for filename, img in batch:
+                try:
+                    ok, buf = cv2.imencode(".jpg", img, JPEG_PARAMS)
+                    if not ok:
+                        raise RuntimeError("JPEG encode failed")
+                    # Stage as .tmp and rename: readers (gallery, Show
+                    # Last) never see a half-written JPEG
+                    tmp = filename + ".tmp"
+                    with open(tmp, "wb") as f:
+                        f.write(buf)
+                    os.replace(tmp, filename)
+                    written.append(filename)
+                except Exception as e:
+                    log_event(f"X-ray SAVE FAILED: {filename}: {e}")
+
+            if written:
+                os.sync()       # one flush to the SD card per batch
+                for filename in written:
+                    log_event(f"X-ray saved: {filename}")
+                    self.saved.emit(filename)
+
+
 class ADCWorker(QThread):
     new_hv = pyqtSignal(float, float)  # V0, HV
     running = True
+    last_hv = None                     # newest sample, read by the GUI
 
     def run(self):
         while self.running:
             v0 = _read_adc_voltage()
             hv = read_hv_voltage()
+            self.last_hv = hv
             self.new_hv.emit(v0, hv)
             self.msleep(80)  # ~12 Hz updates
 
     def stop(self):
         self.running = False
 
+
+class MotorWorker(QThread):
+    """Runs a sequence of blocking motor moves off the GUI thread."""
+    failed = pyqtSignal(str)
+
+    def __init__(self, steps, parent=None):
+        super().__init__(parent)
+        self.steps = steps
+        self.ok = True
+
+    def run(self):
+        for step in self.steps:
+            try:
+                step()
+            except Exception as e:
+                self.ok = False
+                self.failed.emit(f"{step.__name__}: {e}")
+                return
+
+
+class XrayWorker(QThread):
+    """HV on → fixed-exposure still → HV off, off the GUI thread."""
+    captured = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, backend, parent=None):
+        super().__init__(parent)
+        self.backend = backend
+
+    def run(self):
+        try:
+            # STOP / E-STOP may land before HV is on or during the settle
+            self.backend.raise_if_cancelled()
+            hv_on()
+            time.sleep(0.4)
+            self.backend.raise_if_cancelled()
+
+            self.backend.ensure_running()
+            img = self.backend.capture_xray_fixed()
+
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+
+        finally:
+            hv_off()
+            log_event("HV OFF — XRAY sequence completed")
+
+        self.captured.emit(img)
+
+
+class ExportWorker(QThread):
+    """Grab one full-res BGR frame and write it as PNG."""
+    saved = pyqtSignal(str)
+    failed = pyqtSignal(str)
+
+    def __init__(self, backend, parent=None):
+        super().__init__(parent)
+        self.backend = backend
+
+    def run(self):
+        try:
+            frame = self.backend.grab_bgr()     # PATCH-safe backend
+            path, _ = capture_and_save_frame(frame, save_dir="captures")
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.saved.emit(path)
+
+
+class StillLoader(QThread):
+    """Decode a saved still and scale it to the view, off the GUI thread."""
+    loaded = pyqtSignal(object)     # scaled QImage
+    failed = pyqtSignal(str)
+
+    def __init__(self, path, size, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.size = size
+
+    def run(self):
+        img = QImage(self.path)
+        if img.isNull():
+            self.failed.emit(f"Could not read {self.path}")
+            return
+        # Bilinear only pays off on a real downscale; near 1:1 is fast
+        ratio = max(img.width() / max(1, self.size.width()),
+                    img.height() / max(1, self.size.height()))
+        mode = (Qt.TransformationMode.SmoothTransformation if ratio >= 2
+                else Qt.TransformationMode.FastTransformation)
+        self.loaded.emit(
+            img.scaled(self.size, Qt.AspectRatioMode.KeepAspectRatio, mode)
+        )
+
+
+class SwitchWatcher(QThread):
+    """Blocks on libgpiod edge events for the tray switches (SW1/SW2)."""
+    edge = pyqtSignal(int)      # BCM pin that changed
+    running = True
+
+    def __init__(self, pins=(17, 18), parent=None):
+        super().__init__(parent)
+        self.chip = gpiod.Chip("gpiochip0")
+        self.lines = self.chip.get_lines(list(pins))
+        self.lines.request(
+            consumer="xray",
+            type=gpiod.LINE_REQ_EV_BOTH_EDGES,
+            flags=gpiod.LINE_REQ_FLAG_BIAS_PULL_UP
+        )
+
+    def run(self):
+        try:
+            while self.running:
+                ready = self.lines.event_wait(sec=1)
+                if not ready:
+                    continue
+                for line in ready:
+                    line.event_read()
+                    self.edge.emit(line.offset())
+        finally:
+            self.lines.release()
+            self.chip.close()
+
+    def stop(self):
+        self.running = False
+
+
+class CameraWorker(QThread):
+    """Pulls preview frames off the GUI thread; the GUI paints the newest.
+
+    Only one frame_ready is ever queued — if the GUI falls behind, the
+    pending frame is simply replaced by a newer one.
+    """
+    frame_ready = pyqtSignal()
+    running = True
+
+    def __init__(self, backend, parent=None):
+        super().__init__(parent)
+        self.backend = backend
+        self.active = False          # preview on/off (use set_active)
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._latest = None
+        self._pending = False
+
+    def run(self):
+        while self.running:
+            with self.backend.lock:
+                # checked under the lock so a GUI stop can't race a grab
+                # into restarting the camera
+                live = self.active and self.backend.ready
+                if live:
+                    try:
+                        gray = self.backend.grab_gray()
+                    except Exception as e:
+                        log_event(f"PATCH A7 — grab_gray failed: {e}")
+                        live = False
+
+            if not live:
+                # Paused: sleep until set_active()/stop() wakes us. The
+                # timeout only covers the camera coming back on its own.
+                self._wake.wait(0.5)
+                self._wake.clear()
+                continue
+
+            with self._lock:
+                self._latest = gray
+                notify = not self._pending
+                self._pending = True
+            if notify:
+                self.frame_ready.emit()
+
+    def set_active(self, on):
+        self.active = on
+        self._wake.set()
+
+    def take_latest(self):
+        with self._lock:
+            frame, self._latest = self._latest, None
+            self._pending = False
+        return frame
+
+    def stop(self):
+        self.running = False
+        self._wake.set()
+
 # =====================================================
 # CAMERA BACKEND (Patched)
 # =====================================================
 class PiCamBackend:
 
-    def __init__(self, preview_size=(2592,1944), still_size=(2592,1944)):
+    XRAY_EXPOSURE_US = 3_000_000
+    XRAY_GAIN = 8.0
+    XRAY_MAX_WAIT_S = 3.4       # HV-on ceiling for the settle wait
+
+    def __init__(self, preview_size=(640,480), still_size=(2592,1944)):
         self.preview_size = preview_size
         self.still_size   = still_size
         self.cam: Picamera2 | None = None
         self._mode = "stopped"
         self.ready = False  # PATCH A1 — backend state tracking
 
+        # Serialises the preview worker against GUI-side captures/stops
+        self.lock = threading.RLock()
+        # Set from the GUI to abort an X-ray in flight without taking
+        # the lock; the capturing thread stops the camera itself
+        self._cancel = threading.Event()
+
     # -------------------------------------------------
     def start(self):
         """Start camera safely."""
-        try:
-            self.cam = Picamera2()
-
-            self.preview_cfg = self.cam.create_preview_configuration(
-                main={"size": self.preview_size}
-            )
-            self.still_cfg = self.cam.create_still_configuration(
-                main={"size": self.still_size}
-            )
-
-            self.cam.configure(self.preview_cfg)
-            self.cam.start()
-            self._mode = "preview"
-            self.ready = True              # PATCH A1
-            time.sleep(0.15)
-        except Exception as e:
-            self.ready = False
-            log_event(f"PATCH A1 — Camera failed to start: {e}")
-            raise
+        with self.lock:
+            try:
+                self.cam = Picamera2()
+
+                # Full-res BGR main stream + small YUV420 lores stream for
+                # the live view: the lores Y plane *is* the grayscale image,
+                # so the preview path needs no colour conversion at all
+                self.preview_cfg = self.cam.create_preview_configuration(
+                    main={"size": self.still_size, "format": "RGB888"},
+                    lores={"size": self.preview_size, "format": "YUV420"},
+                    display="lores",
+                    # one buffer filling while CameraWorker maps another
+                    buffer_count=3,
+                    queue=True
+                )
+                # Picamera2 "RGB888" is B,G,R byte order — OpenCV's native layout
+                self.still_cfg = self.cam.create_still_configuration(
+                    main={"size": self.still_size, "format": "RGB888"}
+                )
+                # Manual-exposure X-ray mode, built once and entered with
+                # switch_mode(); one buffer is enough for a single long frame
+                self.xray_cfg = self.cam.create_still_configuration(
+                    main={"size": self.still_size, "format": "RGB888"},
+                    controls={
+                        "AnalogueGain": self.XRAY_GAIN,
+                        "ExposureTime": self.XRAY_EXPOSURE_US,
+                        "AeEnable": False,
+                        "AwbEnable": False
+                    },
+                    buffer_count=1
+                )
+
+                self.cam.configure(self.preview_cfg)
+                self.cam.start()
+                self.cam.capture_metadata()    # blocks until the first frame
+                self._mode = "preview"
+                self.ready = True              # PATCH A1
+            except Exception as e:
+                self.ready = False
+                log_event(f"PATCH A1 — Camera failed to start: {e}")
+                raise
 
     # -------------------------------------------------
     def stop(self):
         """Stop camera safely."""
-        try:
-            if self.cam:
-                try: self.cam.stop()
-                except: pass
-                try: self.cam.close()
-                except: pass
-        finally:
-            self.cam = None
-            self.ready = False             # PATCH A1
-            self._mode = "stopped"
-            time.sleep(0.2)
+        with self.lock:
+            try:
+                if self.cam:
+                    try: self.cam.stop()
+                    except: pass
+                    try: self.cam.close()
+                    except: pass
+            finally:
+                self.cam = None
+                self.ready = False             # PATCH A1
+                self._mode = "stopped"
+                time.sleep(0.2)
+
+    # -------------------------------------------------
+    def cancel(self):
+        """Abort an in-flight X-ray (see raise_if_cancelled) — never blocks."""
+        self._cancel.set()
+
+    def clear_cancel(self):
+        """Arm for a new X-ray — call before the XrayWorker starts."""
+        self._cancel.clear()
+
+    def raise_if_cancelled(self):
+        """Stop the camera and raise if cancel() was called."""
+        if self._cancel.is_set():
+            self.stop()
+            raise RuntimeError("X-ray capture cancelled")
 
     # -------------------------------------------------
     def ensure_running(self):
@@ -146,63 +478,139 @@ class PiCamBackend:
 
     # -------------------------------------------------
     def grab_gray(self):
-        self.ensure_running()              # PATCH A1
-
-        if self._mode != "preview":
-            self.cam.switch_mode(self.preview_cfg)
-            self._mode = "preview"
-            time.sleep(0.05)
-
-        frame = self.cam.capture_array("main")  # PATCH A3 safe
-        return cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+        with self.lock:
+            self.ensure_running()              # PATCH A1
+
+            if self._mode != "preview":
+                self.cam.switch_mode(self.preview_cfg)   # returns once streaming
+                self._mode = "preview"
+
+            # Map the DMA buffer instead of capture_array(), which copies
+            # all three YUV planes. Only the luma rows are copied out —
+            # the request goes straight back to libcamera afterwards.
+            w, h = self.preview_size
+            req = self.cam.capture_request()   # PATCH A3 safe
+            try:
+                with MappedArray(req, "lores") as m:
+                    # YUV420 array is (h*3/2, stride): top h rows are luma
+                    return m.array[:h, :w].copy()
+            finally:
+                req.release()
 
     # -------------------------------------------------
     def grab_bgr(self):
-        self.ensure_running()              # PATCH A1
+        with self.lock:
+            self.ensure_running()              # PATCH A1
 
-        if self._mode != "preview":
-            self.cam.switch_mode(self.preview_cfg)
-            self._mode = "preview"
-            time.sleep(0.05)
+            if self._mode != "preview":
+                self.cam.switch_mode(self.preview_cfg)   # returns once streaming
+                self._mode = "preview"
 
-        frame = self.cam.capture_array("main")  # PATCH A3 safe
-        return cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+            # main stream is already full-res BGR ("RGB888")
+            return self.cam.capture_array("main")  # PATCH A3 safe
 
     # -------------------------------------------------
     def capture_xray_fixed(self):
         """Still capture with manual exposure."""
-        self.ensure_running()              # PATCH A2
-
-        cfg = self.cam.create_still_configuration(
-            main={"size": self.still_size},
-            controls={
-                "AnalogueGain": 8.0,
-                "ExposureTime": 3_000_000,
-                "AeEnable": False,
-                "AwbEnable": False
-            }
-        )
+        with self.lock:
+            self.ensure_running()              # PATCH A2
+
+            # Enter still mode (pre-built config, no stop/configure/start)
+            t0 = time.monotonic()
+            self.cam.switch_mode(self.xray_cfg)
+            self._mode = "xray"
+
+            # Take the first frame actually exposed with the manual
+            # settings, but never keep HV on past the old fixed 3.4 s:
+            # if the next frame would land after the cap, use this one
+            frame = None
+            deadline = t0 + self.XRAY_MAX_WAIT_S
+            while frame is None:
+                self.raise_if_cancelled()
+                req = self.cam.capture_request()
+                try:
+                    md = req.get_metadata()
+                    settled = (
+                        md.get("ExposureTime", 0) >= 0.95 * self.XRAY_EXPOSURE_US
+                        and md.get("AnalogueGain", 0) >= 0.99 * self.XRAY_GAIN
+                    )
+                    period = md.get("FrameDuration", self.XRAY_EXPOSURE_US) / 1e6
+                    if settled or time.monotonic() + period > deadline:
+                        frame = req.make_array("main")
+                finally:
+                    req.release()
+
+            log_event(
+                f"X-ray frame after {time.monotonic() - t0:.2f} s "
+                f"({'settled' if settled else 'timeout'})"
+            )
 
-        # Enter still mode
-        self.cam.stop()
-        self.cam.configure(cfg)
-        self.cam.start()
-        time.sleep(3.4)
+            self.raise_if_cancelled()
 
-        frame = self.cam.capture_array("main")
+            # PATCH A8 — return to preview mode safely
+            self.cam.switch_mode(self.preview_cfg)
+            self._mode = "preview"
+
+            return frame   # already BGR — no channel swap needed
 
-        # PATCH A8 — return to preview mode safely
-        self.cam.stop()
-        self.cam.configure(self.preview_cfg)
-        self.cam.start()
-        self._mode = "preview"
+# ============================================================
+# PREVIEW VIEW — paints live frames straight from a QImage
+# ============================================================
+class PreviewView(QLabel):
+    """QLabel that can also draw a live QImage directly.
 
-        return cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+    set_image() skips the per-frame QPixmap conversion + scaled copy: the
+    painter scales the (borrowed) image into the label on paint.
+    setPixmap() still works for stills and clears the live image.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._image = None
+
+    def set_image(self, qimg):
+        self._image = qimg
+        self.update()
+
+    def setPixmap(self, px):
+        self._image = None
+        super().setPixmap(px)
+
+    def paintEvent(self, event):
+        if self._image is None:
+            return super().paintEvent(event)
+
+        # KeepAspectRatio, centred; no SmoothPixmapTransform = fast scale
+        size = self._image.size().scaled(
+            self.size(), Qt.AspectRatioMode.KeepAspectRatio
+        )
+        target = QRect(
+            (self.width() - size.width()) // 2,
+            (self.height() - size.height()) // 2,
+            size.width(), size.height()
+        )
+        p = QPainter(self)
+        p.drawImage(target, self._image)
+        p.end()
 
 # ============================================================
 # GUI MAIN WINDOW
 # ============================================================
 class MainWindow(QMainWindow):
+    sw2_changed = pyqtSignal()   # emitted from the RPi.GPIO edge thread
+    estop_fault = pyqtSignal()   # emitted from the gpio_estop monitor thread
+    estop_release = pyqtSignal()
+
+    # One banner stylesheet, applied once; banner() only flips the
+    # "state" property and re-polishes (no per-call CSS parse)
+    _BANNER_QSS = """
+        QLabel { font-size:26px; font-weight:bold; padding:8px; }
+        QLabel[state="green"]  { background-color:#4CAF50; color:white; }
+        QLabel[state="blue"]   { background-color:#2196F3; color:white; }
+        QLabel[state="yellow"] { background-color:#FFEB3B; color:black; }
+        QLabel[state="red"]    { background-color:#F44336; color:white; }
+    """
+    _BANNER_STATES = ("green", "blue", "yellow", "red")
 
     def __init__(self):
         super().__init__()
@@ -237,8 +645,20 @@ class MainWindow(QMainWindow):
         self.preview_was_running_before_estop = False
 
         self._last_banner_time = 0
+        self._last_banner = ("System Ready", None)   # (text, color) on screen
         self._force_banner = False
 
+        self.motor_job = None
+        self.xray_job = None
+        self._xray_cancelled = False      # STOP/E-STOP cancelled the shot
+        self.export_job = None
+        self.still_job = None
+        # Scaled stills, keyed by _still_key(file) — survives repeated
+        # "Show Last" clicks; a resize naturally misses (size is in the key)
+        QPixmapCache.setCacheLimit(64 * 1024)   # KB
+        self._capture_index = None       # cached _list_captures() result
+        self._capture_dir_mtime = None
+
         # --------------------------------------------------------
         # Hardware inputs
         # --------------------------------------------------------
@@ -246,6 +666,37 @@ class MainWindow(QMainWindow):
         GPIO.setup(18, GPIO.IN, pull_up_down=GPIO.PUD_UP)
         GPIO.setup(17, GPIO.IN, pull_up_down=GPIO.PUD_UP)
 
+        # Tray switch edges drive check_alignment() — no polling timer.
+        # Preferred: libgpiod events on SW1 + SW2 from a QThread. Fallback:
+        # RPi.GPIO edge callback on SW2 (runs on RPi.GPIO's thread, so hop
+        # to the GUI thread through a signal) plus a slow safety re-check.
+        self.switch_watcher = None
+        self._align_pending = False
+        self._sw2_edges = False
+        if gpiod is not None:
+            try:
+                self.switch_watcher = SwitchWatcher(parent=self)
+                self.switch_watcher.edge.connect(self._on_switch_edge)
+                self.switch_watcher.start()
+            except Exception as e:
+                log_event(f"libgpiod switch events unavailable: {e}")
+                self.switch_watcher = None
+
+        if self.switch_watcher is None:
+            self.sw2_changed.connect(self.check_alignment)
+            try:
+                try:
+                    GPIO.add_event_detect(18, GPIO.BOTH,
+                                          callback=lambda ch: self.sw2_changed.emit(),
+                                          bouncetime=30)
+                except RuntimeError:
+                    # stepper_Motor may already detect SW2 (limit edges) —
+                    # RPi.GPIO allows one detector per pin, so share it
+                    GPIO.add_event_callback(18, lambda ch: self.sw2_changed.emit())
+                self._sw2_edges = True
+            except Exception as e:
+                log_event(f"SW2 edge detection unavailable — polling: {e}")
+
         # --------------------------------------------------------
         # Camera backend
         # --------------------------------------------------------
@@ -259,10 +710,17 @@ class MainWindow(QMainWindow):
 
         # --- Banner label ---
         self.alarm = QLabel("System Ready", alignment=Qt.AlignmentFlag.AlignCenter)
-        self.alarm.setStyleSheet("font-size:26px;font-weight:bold;padding:8px;")
+        self.alarm.setProperty("state", "default")
+        self.alarm.setStyleSheet(self._BANNER_QSS)
+        self._banner_color = None
 
         # --- Camera preview label ---
-        self.view = QLabel("Camera", alignment=Qt.AlignmentFlag.AlignCenter)
+        self.view = PreviewView("Camera", alignment=Qt.AlignmentFlag.AlignCenter)
+
+        # Cached label size (updated in eventFilter on resize)
+        self._view_size = self.view.size()
+        self._last_frame = None      # buffer borrowed by the preview QImage
+        self.view.installEventFilter(self)
 
         # --- STATUS LABELS (HV + ANGLE) ---
         self.lbl_adc = QLabel("HV: -- kV", alignment=Qt.AlignmentFlag.AlignCenter)
@@ -303,6 +761,18 @@ class MainWindow(QMainWindow):
             "background-color: #D32F2F; color: white; font-weight: bold; font-size: 18px; padding: 10px;"
         )
 
+        # Buttons gated by the safety system (E-STOP / HV fault).
+        # Only touched on state transitions — see set_safety_buttons().
+        self._safety_btns = (
+            self.btn_open, self.btn_close,
+            self.btn_rotate, self.btn_home3,
+            self.btn_preview, self.btn_xray,
+            self.btn_gallery, self.btn_show_last,
+            self.btn_editor, self.btn_shutdown
+        )
+        self._safety_btns_enabled = True
+        self._estop_state = None
+
         # --------------------------------------------------------
         # LAYOUTS
         # --------------------------------------------------------
@@ -399,45 +869,64 @@ class MainWindow(QMainWindow):
             self.has_started = True
             self.has_closed_once = False
             self.armed = False
-            self.all_leds_off()
-            self.leds.write(self.leds.amber, True)
-            self.banner("Tray Open — Insert Sample", color="yellow")
-            log_event("PATCH B1 — Startup detected: TRAY OPEN")
+            self.set_status(self.leds.amber, "Tray Open — Insert Sample", color="yellow",
+                            log="PATCH B1 — Startup detected: TRAY OPEN")
 
         elif sw2 == 0:
             self.has_started = True
             self.has_closed_once = True
             self.armed = True
-            self.all_leds_off()
-            self.leds.write(self.leds.green, True)
-            self.banner("Sample Aligned — Ready for X-Ray", color="green")
-            log_event("PATCH B1 — Startup detected: TRAY CLOSED")
+            self.set_status(self.leds.green, "Sample Aligned — Ready for X-Ray", color="green",
+                            log="PATCH B1 — Startup detected: TRAY CLOSED")
 
         else:
             self.has_started = True
             self.has_closed_once = False
             self.armed = False
-            self.all_leds_off()
-            self.leds.write(self.leds.amber, True)
-            self.banner("Tray Position Unknown — Please CLOSE Tray", color="yellow")
-            log_event("PATCH B1 — Startup detected: TRAY UNKNOWN")
+            self.set_status(self.leds.amber, "Tray Position Unknown — Please CLOSE Tray", color="yellow",
+                            log="PATCH B1 — Startup detected: TRAY UNKNOWN")
 
         # --------------------------------------------------------
         # Timers
         # --------------------------------------------------------
-        self.timer = QTimer(self)       # preview timer
-        self.timer.setInterval(33)
-        self.timer.timeout.connect(self.update_frame)
+        # Preview frames come from CameraWorker, not a polling timer
+        self.cam_worker = CameraWorker(self.backend, self)
+        self.cam_worker.frame_ready.connect(
+            self.update_frame, Qt.ConnectionType.QueuedConnection
+        )
+        self.cam_worker.start()
+
+        # X-ray JPEGs are encoded + written here, never on the GUI thread
+        self.writer = CaptureWriter(parent=self)
+        self.writer.saved.connect(self.on_capture_saved)
+        self.writer.start()
 
+        # HV safety check — runs only while an exposure is in flight
+        # (started in on_xray, stopped in on_xray_finished)
         self.adc_timer = QTimer(self)
-        self.adc_timer.setInterval(300)
+        self.adc_timer.setInterval(100)
         self.adc_timer.timeout.connect(self.check_adc_safety)
 
+        # Only used without libgpiod: slow safety re-check when SW2 edges
+        # come from RPi.GPIO, full 100 ms polling when there are none
         self.align_timer = QTimer(self)
-        self.align_timer.setInterval(100)
+        self.align_timer.setInterval(1000 if self._sw2_edges else 100)
         self.align_timer.timeout.connect(self.check_alignment)
 
         # HEARTBEAT TIMER — GUI proves it's alive
+        # Heartbeat lives in an 8-byte mmap'd file (little-endian double)
+        # read by hv_kill_daemon — no open/write/close per beat
+        self._hb_mm = None
+        try:
+            fd = os.open("/tmp/xray_heartbeat", os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                os.ftruncate(fd, 8)
+                self._hb_mm = mmap.mmap(fd, 8)
+            finally:
+                os.close(fd)
+        except Exception as e:
+            log_event(f"Heartbeat map failed: {e}")
+
         self.heartbeat_timer = QTimer(self)
         self.heartbeat_timer.setInterval(200)
         self.heartbeat_timer.timeout.connect(self.send_heartbeat)
@@ -453,17 +942,22 @@ class MainWindow(QMainWindow):
         # --------------------------------------------------------
         # ⭐ START E-STOP MONITOR
         # --------------------------------------------------------
-        gpio_estop.start_monitor(self.handle_estop_fault,
-                                 self.handle_estop_release)
+        # The monitor calls back on its own thread; the handlers touch
+        # widgets, timers and the camera, so run them on the GUI thread
+        self.estop_fault.connect(self.handle_estop_fault)
+        self.estop_release.connect(self.handle_estop_release)
+        gpio_estop.start_monitor(self.estop_fault.emit,
+                                 self.estop_release.emit)
 
     # ============================================================
     # HEARTBEAT WRITER
     # ============================================================
     def send_heartbeat(self):
-        """Writes a timestamp file proving GUI is alive."""
+        """Stamps the shared heartbeat page proving GUI is alive."""
+        if self._hb_mm is None:
+            return
         try:
-            with open("/tmp/xray_heartbeat", "w") as f:
-                f.write(str(time.time()))
+            struct.pack_into("<d", self._hb_mm, 0, time.time())
         except:
             pass
 
@@ -472,84 +966,143 @@ class MainWindow(QMainWindow):
     # E-STOP: PRESS HANDLER
     # ============================================================
     def handle_estop_fault(self):
+        if self._estop_state is True:
+            return
+        self._estop_state = True
+
+        # Stop any tray/rotation move at its next step
+        motor_abort.set()
+
         # PATCH A6 — record preview state before shutoff
         self.preview_was_running_before_estop = self.preview_on
 
-        try: self.timer.stop()
-        except: pass
+        self.cam_worker.set_active(False)
         try: self.adc_timer.stop()
         except: pass
         try: self.align_timer.stop()
         except: pass
         try: hv_off()
         except: pass
-        try: self.backend.stop()
-        except: pass
+        self._stop_camera()
 
-        self.all_leds_off()
-        self.leds.write(self.leds.red, True)
-        self.banner("E-STOP PRESSED — SYSTEM HALTED", color="red")
-        log_event("EMERGENCY STOP PRESSED — SYSTEM HALTED")
+        self.set_status(self.leds.red, "E-STOP PRESSED — SYSTEM HALTED", color="red",
+                        log="EMERGENCY STOP PRESSED — SYSTEM HALTED")
 
         # Disable controls
-        for b in (
-            self.btn_open, self.btn_close,
-            self.btn_rotate, self.btn_home3,
-            self.btn_preview, self.btn_xray,
-            self.btn_gallery, self.btn_show_last,
-            self.btn_editor, self.btn_shutdown
-        ):
-            b.setEnabled(False)
+        self.set_safety_buttons(False)
 
 
     # ============================================================
     # ⭐ E-STOP: RELEASE HANDLER (PATCH A6)
     # ============================================================
     def handle_estop_release(self):
+        if self._estop_state is False:
+            return
+        self._estop_state = False
 
-        # Restart timers in GUI thread
-        QTimer.singleShot(0, self.adc_timer.start)
-        QTimer.singleShot(0, self.align_timer.start)
+        motor_abort.clear()
 
-        # Re-enable controls
-        for b in (
-            self.btn_open, self.btn_close,
-            self.btn_rotate, self.btn_home3,
-            self.btn_preview, self.btn_xray, self.btn_stop,
-            self.btn_gallery, self.btn_show_last,
-            self.btn_editor, self.btn_shutdown
-        ):
-            b.setEnabled(True)
+        # Restart timers in GUI thread (adc_timer only runs during a shot)
+        QTimer.singleShot(0, self.start_align_timer)
 
-        # Restart camera safely (PATCH A6 / A1)
-        try:
-            log_event("PATCH A6 — Restarting camera backend after E-STOP")
-            self.backend.start()
-        except:
-            log_event("PATCH A6 ERROR — Camera failed to restart after E-STOP")
+        # Re-enable controls and the camera (a cancelled shot still
+        # winding down does both in on_xray_finished)
+        if self.xray_job is None:
+            self.set_safety_buttons(True)
+            self.btn_stop.setEnabled(True)
+
+            # Restart camera safely (PATCH A6 / A1)
+            try:
+                log_event("PATCH A6 — Restarting camera backend after E-STOP")
+                self.backend.start()
+            except:
+                log_event("PATCH A6 ERROR — Camera failed to restart after E-STOP")
 
         # Restore preview only if it was active before
         if self.preview_was_running_before_estop:
             log_event("PATCH A6 — Auto-restoring preview")
             self.preview_on = True
-            QTimer.singleShot(0, self.timer.start)
+            self.cam_worker.set_active(True)
         else:
             log_event("PATCH A6 — Preview was OFF before E-STOP; not restoring")
 
         # Reset UI
-        self.all_leds_off()
-        self.banner("System Ready")
-        log_event("E-STOP released — system re-enabled")
+        self.set_status(None, "System Ready",
+                        log="E-STOP released — system re-enabled")
+
+        # Redraw the tray/alignment state now rather than on the next edge
+        # (forced: the banner throttle would drop it right after the above)
+        self._force_banner = True
+        self.check_alignment()
+        self._force_banner = False
+
+
+    # ============================================================
+    # SAFETY BUTTONS — only touch widgets on transitions
+    # ============================================================
+    def set_safety_buttons(self, enabled):
+        if enabled == self._safety_btns_enabled:
+            return
+        self._safety_btns_enabled = enabled
+
+        for b in self._safety_btns:
+            b.setEnabled(enabled)
 
 
     # ============================================================
-    # LED RESET
+    # MOTOR JOBS — blocking moves run on a MotorWorker thread
+    # ============================================================
+    def run_motor_job(self, steps, on_done=None):
+        if self.motor_job is not None:
+            log_event("Motor busy — request ignored")
+            return False
+
+        self.set_safety_buttons(False)
+
+        job = MotorWorker(steps, self)
+        job.failed.connect(self.on_motor_failed)
+        job.finished.connect(lambda: self.on_motor_finished(on_done))
+        self.motor_job = job
+        job.start()
+        return True
+
+    def on_motor_finished(self, on_done=None):
+        ok = self.motor_job.ok
+        self.motor_job.deleteLater()
+        self.motor_job = None
+
+        # An aborted/failed move never reached its end position
+        if on_done is not None and ok:
+            on_done()
+
+        if not self.hv_fault_active and not gpio_estop.faulted():
+            self.set_safety_buttons(True)
+
+        # Settle the tray/alignment state now rather than on the next tick
+        self.check_alignment()
+
+    def on_motor_failed(self, msg):
+        log_event(f"MOTOR ERROR: {msg}")
+        # An E-STOP abort is expected — keep the E-STOP banner up
+        if motor_abort.is_set() or self._estop_state:
+            return
+        self.banner(f"Motor Error — {msg}", color="red")
+
+
+    # ============================================================
+    # LED / STATUS
     # ============================================================
     def all_leds_off(self):
-        self.leds.write(self.leds.red, False)
-        self.leds.write(self.leds.amber, False)
-        self.leds.write(self.leds.green, False)
-        self.leds.write(self.leds.blue, False)
+        self.leds.set_all(False, False, False, False)
+
+    def set_status(self, led, text, color=None, log=None):
+        """Light only `led` (None = all off), show the banner, log once."""
+        leds = self.leds
+        leds.set_all(led == leds.red, led == leds.amber,
+                     led == leds.green, led == leds.blue)
+        self.banner(text, color=color)
+        if log:
+            log_event(log)
 
 
     # ============================================================
@@ -558,6 +1111,10 @@ class MainWindow(QMainWindow):
     def banner(self, text, color=None):
         """Prevents banner spam flooding logs every 33ms."""
 
+        # Already showing exactly this — no log line, no repaint
+        if (text, color) == self._last_banner:
+            return
+
         now = time.time()
         if not self._force_banner:
             if now - self._last_banner_time < 0.10:
@@ -567,20 +1124,16 @@ class MainWindow(QMainWindow):
 
         log_event(f"BANNER: {text}")
 
-        # Colors
-        if color == "green":
-            st = "background-color:#4CAF50;color:white;font-size:26px;font-weight:bold;padding:8px;"
-        elif color == "blue":
-            st = "background-color:#2196F3;color:white;font-size:26px;font-weight:bold;padding:8px;"
-        elif color == "yellow":
-            st = "background-color:#FFEB3B;color:black;font-size:26px;font-weight:bold;padding:8px;"
-        elif color == "red":
-            st = "background-color:#F44336;color:white;font-size:26px;font-weight:bold;padding:8px;"
-        else:
-            st = "font-size:26px;font-weight:bold;padding:8px;"
-
-        self.alarm.setStyleSheet(st)
+        # Colors — re-polish only on change
+        if color not in self._BANNER_STATES:
+            color = None
+        if color != self._banner_color:
+            self.alarm.setProperty("state", color or "default")
+            self.alarm.style().unpolish(self.alarm)
+            self.alarm.style().polish(self.alarm)
+            self._banner_color = color
         self.alarm.setText(text)
+        self._last_banner = (text, color)
 
 
     # ============================================================
@@ -591,7 +1144,10 @@ class MainWindow(QMainWindow):
         if not self.hv_active:
             return
 
-        hv = read_hv_voltage()
+        # Newest sample from ADCWorker — no I2C read on the GUI thread
+        hv = self.adc_thread.last_hv
+        if hv is None:
+            return
         ok, msg = hv_status_ok(hv)
 
         log_event(f"ADC CHECK — HV reading: {hv:.2f} V")
@@ -602,21 +1158,14 @@ class MainWindow(QMainWindow):
             hv_off()
             self.hv_active = False
 
-            self.all_leds_off()
-            self.leds.write(self.leds.red, True)
-            self.banner(f"HV FAULT — {msg}", color="red")
+            # Abort the exposure — a frame taken under a faulted HV is junk
+            self._stop_camera()
 
-            # Disable all control buttons
-            for b in (
-                self.btn_open, self.btn_close,
-                self.btn_rotate, self.btn_home3,
-                self.btn_xray, self.btn_preview,
-                self.btn_stop, self.btn_gallery,
-                self.btn_show_last, self.btn_editor,
-                self.btn_shutdown
+            self.set_status(self.leds.red, f"HV FAULT — {msg}", color="red")
 
-            ):
-                b.setEnabled(False)
+            # Disable all control buttons
+            self.set_safety_buttons(False)
+            self.btn_stop.setEnabled(False)
 
             return
 
@@ -626,38 +1175,53 @@ class MainWindow(QMainWindow):
 
         self.hv_fault_active = False
 
-        # Re-enable buttons after recovery
-        for b in (
-            self.btn_open, self.btn_close,
-            self.btn_rotate, self.btn_home3,
-            self.btn_xray, self.btn_preview,
-            self.btn_gallery, self.btn_show_last,
-            self.btn_editor, self.btn_shutdown,
-        ):
-            b.setEnabled(True)
+        # Mid-shot the controls stay locked — on_xray_finished re-enables
+        if self.xray_job is not None:
+            return
+
+        # Re-enable buttons after recovery (no-op unless state changed)
+        self.set_safety_buttons(True)
 
 
 
     # ============================================================
     # ALIGNMENT SYSTEM (SW2)
     # ============================================================
+    def start_align_timer(self):
+        # libgpiod delivers every SW1/SW2 edge — nothing to poll
+        if self.switch_watcher is None:
+            self.align_timer.start()
+
+    def _on_switch_edge(self, pin):
+        # Coalesce contact bounce: one check ~30 ms after the first edge
+        if self._align_pending:
+            return
+        self._align_pending = True
+        QTimer.singleShot(30, self._run_switch_check)
+
+    def _run_switch_check(self):
+        self._align_pending = False
+        self.check_alignment()
+
     def check_alignment(self):
 
-        if self.hv_fault_active:
+        # E-STOP owns the banner/LEDs until release (switch edges still fire)
+        if self.hv_fault_active or self._estop_state:
+            return
+
+        # Tray still moving / shot in progress — the job's finish settles it
+        if self.motor_job is not None or self.xray_job is not None:
             return
 
         if not self.has_started:
-            self.all_leds_off()
-            self.banner("System Ready")
+            self.set_status(None, "System Ready")
             return
 
         # Tray has not been fully closed yet
         if not self.has_closed_once:
             self.armed = False
-            self.all_leds_off()
-            self.leds.write(self.leds.amber, True)
-            self.banner("Tray Open — Insert Sample", color="yellow")
-            log_event("Tray opened")
+            self.set_status(self.leds.amber, "Tray Open — Insert Sample", color="yellow",
+                            log="Tray opened")
             return
 
         # SW2 status check
@@ -665,16 +1229,12 @@ class MainWindow(QMainWindow):
 
         if sw2 == 0:
             self.armed = True
-            self.all_leds_off()
-            self.leds.write(self.leds.green, True)
-            self.banner("Sample Aligned — Ready for X-Ray", color="green")
-            log_event("Sample aligned — SW2 engaged")
+            self.set_status(self.leds.green, "Sample Aligned — Ready for X-Ray", color="green",
+                            log="Sample aligned — SW2 engaged")
         else:
             self.armed = False
-            self.all_leds_off()
-            self.leds.write(self.leds.amber, True)
-            self.banner("Tray Closing…", color="yellow")
-            log_event("Tray closing")
+            self.set_status(self.leds.amber, "Tray Closing…", color="yellow",
+                            log="Tray closing")
 
 
 
@@ -690,13 +1250,12 @@ class MainWindow(QMainWindow):
         self.has_started = True
         self.has_closed_once = False
 
-        self.all_leds_off()
-        self.leds.write(self.leds.amber, True)
+        self.set_status(self.leds.amber, "Tray Opening…", color="yellow")
 
-        motor3_home()
-        motor1_backward_until_switch1()
-
-        self.banner("Tray Open — Insert Sample", color="yellow")
+        self.run_motor_job(
+            [motor3_home, motor1_backward_until_switch1],
+            on_done=lambda: self.banner("Tray Open — Insert Sample", color="yellow")
+        )
 
 
 
@@ -711,10 +1270,14 @@ class MainWindow(QMainWindow):
 
         self.has_started = True
 
-        self.all_leds_off()
-        self.leds.write(self.leds.amber, True)
+        self.set_status(self.leds.amber, "Tray Closing…", color="yellow")
+
+        self.run_motor_job(
+            [motor1_forward_until_switch2],
+            on_done=self.on_tray_closed
+        )
 
-        motor1_forward_until_switch2()
+    def on_tray_closed(self):
         self.has_closed_once = True
 
 
@@ -745,11 +1308,13 @@ class MainWindow(QMainWindow):
             log_event("PATCH B4 — Rotation blocked (HV fault)")
             return
 
-        self.current_angle = (self.current_angle + 45) % 360
-
         # SAFE rotation
         log_event("PATCH B4 — Rotation allowed, rotating 45°")
-        motor3_rotate_45()
+        # Angle only advances once the move completes (not on abort/failure)
+        self.run_motor_job(
+            [motor3_rotate_45],
+            on_done=lambda: self._set_angle(self.current_angle + 45)
+        )
 
 
 
@@ -759,10 +1324,12 @@ class MainWindow(QMainWindow):
     # ============================================================
     def on_home3(self):
         log_event("Motor 3 going HOME")
-        self.current_angle = 0
 
         if not self.hv_fault_active:
-            motor3_home()
+            self.run_motor_job([motor3_home], on_done=lambda: self._set_angle(0))
+
+    def _set_angle(self, angle):
+        self.current_angle = angle % 360
 
     # ============================================================
     # PREVIEW TOGGLE
@@ -772,11 +1339,11 @@ class MainWindow(QMainWindow):
         if not self.preview_on:
             log_event("Preview started")
             self.preview_on = True
-            QTimer.singleShot(0, self.timer.start)  # PATCH A7 safely start timer
+            self.cam_worker.set_active(True)
         else:
             log_event("Preview stopped")
             self.preview_on = False
-            QTimer.singleShot(0, self.timer.stop)   # PATCH A7 safely stop timer
+            self.cam_worker.set_active(False)
 
 
 
@@ -788,21 +1355,38 @@ class MainWindow(QMainWindow):
         log_event("STOP pressed — shutting down preview/camera/HV")
 
         self.preview_on = False
-        try: self.timer.stop()
-        except: pass
+        self.cam_worker.set_active(False)
+
+        self._stop_camera()
+
+        self.set_status(None, "STOPPED", color="red")
+
+        # Redraw the tray/alignment state now rather than on the next edge
+        # (forced: the banner throttle would drop it right after the above)
+        self._force_banner = True
+        self.check_alignment()
+        self._force_banner = False
 
+    def _stop_camera(self):
+        # Mid-shot the X-ray worker holds the backend lock for the whole
+        # exposure — ask it to cancel (it stops the camera) rather than
+        # block the GUI thread on backend.stop()
+        if self.xray_job is not None:
+            self._xray_cancelled = True
+            self.backend.cancel()
+            return
         try: self.backend.stop()
         except: pass
 
-        self.all_leds_off()
-        self.banner("STOPPED", color="red")
-
 
 
     # ============================================================
     # XRAY CAPTURE (PATCH A5–A8)
     # ============================================================
     def on_xray(self):
+        if self.xray_job is not None:
+            return
+
         log_event("XRAY capture initiated — HV ON requested")
 
         if self.hv_fault_active:
@@ -820,57 +1404,70 @@ class MainWindow(QMainWindow):
         self.hv_max = None
 
         # UI & LED
-        self.all_leds_off()
-        self.leds.write(self.leds.blue, True)
         self._force_banner = True
-        self.banner("HV On — Taking X-Ray Picture", color="blue")
+        self.set_status(self.leds.blue, "HV On — Taking X-Ray Picture", color="blue")
         self._force_banner = False
-        QApplication.processEvents()
-
-        try:
-            hv_on()
-            time.sleep(0.4)
 
-            self.backend.ensure_running()
-            img = self.backend.capture_xray_fixed()
+        # HV + exposure run on XrayWorker; the GUI (and the ADC safety
+        # check) keep running during the ~3 s shot
+        # STOP stays live: mid-shot it cancels the capture (_stop_camera)
+        self.set_safety_buttons(False)
+        self._xray_cancelled = False
+        self.backend.clear_cancel()      # before the worker can check it
+        self.adc_timer.start()
+        job = XrayWorker(self.backend, self)
+        job.captured.connect(self.on_xray_captured)
+        job.failed.connect(self.on_xray_failed)
+        job.finished.connect(self.on_xray_finished)
+        self.xray_job = job
+        job.start()
+
+    def on_xray_failed(self, msg):
+        self.hv_active = False
+        if self._xray_cancelled:
+            log_event(f"XRAY cancelled: {msg}")
+            return
+        QMessageBox.critical(self, "Error", "Camera failure — HV turned OFF for safety.")
+        log_event(f"XRAY ERROR: {msg}")
+
+    def on_xray_finished(self):
+        self.xray_job.deleteLater()
+        self.xray_job = None
+        self.adc_timer.stop()
+
+        if not self.hv_fault_active and not gpio_estop.faulted():
+            self.set_safety_buttons(True)
+            self.btn_stop.setEnabled(True)
+
+        # The cancelled shot stopped the camera and the preview worker
+        # never restarts it — bring it back once E-STOP/fault are clear
+        if (self._xray_cancelled and not self._estop_state
+                and not self.hv_fault_active and not gpio_estop.faulted()):
+            try:
+                log_event("PATCH A6 — Restarting camera backend after cancelled X-ray")
+                self.backend.start()
+            except:
+                log_event("PATCH A6 ERROR — Camera failed to restart after cancelled X-ray")
 
-        except Exception as e:
-            hv_off()
-            self.hv_active = False
-            QMessageBox.critical(self, "Error", "Camera failure — HV turned OFF for safety.")
-            log_event(f"XRAY ERROR: {e}")
+    def on_xray_captured(self, img):
+        # Frame finished before the cancel landed — still not a valid X-ray
+        if self.hv_fault_active:
+            log_event("XRAY discarded — HV fault during the shot")
             return
 
-        finally:
-            hv_off()
-            log_event("HV OFF — XRAY sequence completed")
+        # UI Reset — unless an E-STOP raised during the shot owns the
+        # LEDs and banner
+        if not (self._estop_state or gpio_estop.faulted()):
+            self.set_status(self.leds.green, "Sample Aligned — Ready for X-Ray", color="green")
 
+        # Save image — JPEG encode + SD write run on the writer thread
+        timestamp = time.strftime("%Y-%m-%d_%H-%M-%S")
+        filename = str(CAPTURE_DIR / f"capture_{timestamp}.jpg")
+        self.writer.put(filename, img)   # indexed in on_capture_saved
 
-            
-        # UI Reset
-        self.all_leds_off()
-        self.leds.write(self.leds.green, True)
-        self.banner("Sample Aligned — Ready for X-Ray", color="green")
-
-        # Save image
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        filename = (
-            f"/home/xray_juanito/Capstone_Xray_Imaging/captures/"
-            f"capture_{timestamp}.jpg"
-        )
-        cv2.imwrite(filename, img)
-        log_event(f"X-ray saved: {filename}")
-
-        # Display
-        disp = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        h, w = disp.shape[:2]
-        qimg = QImage(disp.data, w, h, 3*w, QImage.Format.Format_RGB888)
-        px = QPixmap.fromImage(qimg).scaled(
-            self.view.size(),
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
-        )
-        self.view.setPixmap(px)
+        # Display — keep the scaled pixmap so "Show Last" can reuse it
+        px = self._display_bgr(img)
+        QPixmapCache.insert(self._still_key(filename), px)
 
         QTimer.singleShot(120, self.compute_hv_minmax)
 
@@ -892,31 +1489,127 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self,"Preview Active","Turn OFF preview first.")
             return
 
-        import glob, os
-        base = "/home/xray_juanito/Capstone_Xray_Imaging/captures"
-
-        # PATCH B2 — sort by modification time instead of alphabetically
-        files = glob.glob(base+"/*.jpg") + glob.glob(base+"/*.png")
-        if not files:
+        # PATCH B2 — newest by modification time, not alphabetically
+        last_file = self._latest_capture_path()
+        if last_file is None:
             QMessageBox.warning(self,"No Images","None found.")
             return
 
-        files = sorted(files, key=os.path.getmtime)  # newest last
-        last_file = files[-1]
+        key = self._still_key(last_file)
+        cached_px = QPixmapCache.find(key)
+        if cached_px is not None:
+            # Already scaled for this view size
+            self.view.setPixmap(cached_px)
+            self._show_last_done(last_file)
+            return
 
-        img = cv2.imread(last_file)
-        disp = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        h, w = disp.shape[:2]
-        qimg = QImage(disp.data, w, h, 3*w, QImage.Format.Format_RGB888)
-        px = QPixmap.fromImage(qimg).scaled(
-            self.view.size(),
+        if self.still_job is not None:
+            return
+
+        # Decode + scale on StillLoader; the GUI only wraps the result
+        job = StillLoader(last_file, self._view_size, self)
+        job.loaded.connect(lambda qimg: self.on_still_loaded(job, key, qimg))
+        job.failed.connect(lambda msg: QMessageBox.warning(self, "Read Error", msg))
+        job.finished.connect(self.on_still_finished)
+        self.still_job = job
+        job.start()
+
+    def on_still_loaded(self, job, key, qimg):
+        px = QPixmap.fromImage(qimg)
+        QPixmapCache.insert(key, px)
+        if self.preview_on:      # live view took over while we decoded
+            return
+        self.view.setPixmap(px)
+        self._show_last_done(job.path)
+
+    def on_still_finished(self):
+        self.still_job.deleteLater()
+        self.still_job = None
+
+    def _show_last_done(self, path):
+        self.banner("Showing Last X-Ray", color="yellow")
+        log_event(f"PATCH B2 — Showing last X-Ray: {path}")
+
+
+    # ============================================================
+    # CAPTURE HELPERS (shared by show-last / editor / gallery / xray)
+    # ============================================================
+    def _capture_paths(self):
+        """Cached capture paths, oldest → newest by mtime (do not mutate).
+
+        The scandir pass is only redone when the directory's own mtime
+        changes (a file was added, removed or renamed).
+        """
+        dir_mtime = os.stat(CAPTURE_DIR).st_mtime_ns
+        if self._capture_index is None or dir_mtime != self._capture_dir_mtime:
+            exts = (".jpg", ".jpeg", ".png")
+            with os.scandir(CAPTURE_DIR) as it:
+                entries = [
+                    e for e in it
+                    if e.is_file() and e.name.lower().endswith(exts)
+                ]
+            entries.sort(key=lambda e: e.stat().st_mtime)
+            self._capture_index = [e.path for e in entries]
+            self._capture_dir_mtime = dir_mtime
+        return self._capture_index
+
+    def on_capture_saved(self, filename):
+        # The write landed — add it to the cached index and adopt the
+        # directory's new mtime so the cache stays valid without a rescan
+        if self._capture_index is None:
+            return
+        if filename not in self._capture_index:
+            self._capture_index.append(filename)
+        try:
+            self._capture_dir_mtime = os.stat(CAPTURE_DIR).st_mtime_ns
+        except OSError:
+            self._capture_index = None
+
+    def _list_captures(self):
+        """Capture paths, oldest → newest by mtime (caller-owned copy)."""
+        return list(self._capture_paths())
+
+    def _latest_capture_path(self):
+        files = self._capture_paths()
+        return files[-1] if files else None
+
+    def _still_key(self, path):
+        return f"{path}_{self._view_size.width()}x{self._view_size.height()}"
+
+    def _display_bgr(self, img):
+        """Show a BGR still in the main view (area-downscaled to fit)."""
+        # Shrink with cv2 INTER_AREA before Qt sees it, so no smooth
+        # scale ever runs at the full sensor resolution
+        h, w = img.shape[:2]
+        scale = min(self._view_size.width() / w, self._view_size.height() / h)
+        if 0 < scale < 1:
+            img = cv2.resize(
+                img, (max(1, round(w * scale)), max(1, round(h * scale))),
+                interpolation=cv2.INTER_AREA
+            )
+            h, w = img.shape[:2]
+
+        # Qt reads BGR natively — no channel-swap pass. fromImage() copies,
+        # so img only has to outlive this call.
+        qimg = QImage(
+            sip.voidptr(img.ctypes.data), w, h, img.strides[0],
+            QImage.Format.Format_BGR888
+        )
+        px = QPixmap.fromImage(qimg)
+        if scale >= 1:
+            return self._display_pixmap(px)
+        self.view.setPixmap(px)
+        return px
+
+    def _display_pixmap(self, px):
+        """Scale a still to the view and show it; returns the scaled pixmap."""
+        px = px.scaled(
+            self._view_size,
             Qt.AspectRatioMode.KeepAspectRatio,
             Qt.TransformationMode.SmoothTransformation
         )
         self.view.setPixmap(px)
-
-        self.banner("Showing Last X-Ray", color="yellow")
-        log_event(f"PATCH B2 — Showing last X-Ray: {last_file}")
+        return px
 
 
 
@@ -924,13 +1617,19 @@ class MainWindow(QMainWindow):
     # EXPORT FRAME (manual save)
     # ============================================================
     def on_export(self):
+        if self.export_job is not None:
+            return
 
-        try:
-            frame = self.backend.grab_bgr()     # PATCH-safe backend
-            filename = capture_and_save_frame(frame, save_dir="captures")
-            self.status.showMessage(f"Saved {filename}")
-        except Exception as e:
-            QMessageBox.critical(self, "Export", str(e))
+        job = ExportWorker(self.backend, self)
+        job.saved.connect(lambda f: self.status.showMessage(f"Saved {f}"))
+        job.failed.connect(lambda msg: QMessageBox.critical(self, "Export", msg))
+        job.finished.connect(self.on_export_finished)
+        self.export_job = job
+        job.start()
+
+    def on_export_finished(self):
+        self.export_job.deleteLater()
+        self.export_job = None
 
     # ============================================================
     # GALLERY WINDOW
@@ -938,14 +1637,15 @@ class MainWindow(QMainWindow):
     def on_gallery(self):
         log_event("Gallery opened")
 
-        base_dir = Path("/home/xray_juanito/Capstone_Xray_Imaging/captures")
-        all_imgs = sorted(list(base_dir.glob("*.jpg")) + list(base_dir.glob("*.png")))
+        # Oldest → newest by mtime so mixed filename formats still come
+        # out in capture order
+        files = self._list_captures()
 
-        if not all_imgs:
+        if not files:
             QMessageBox.information(self, "Gallery", "No images found.")
             return
 
-        Gallery([str(p) for p in all_imgs]).run()
+        Gallery(files).run()
 
 
 
@@ -954,15 +1654,12 @@ class MainWindow(QMainWindow):
     # ============================================================
     def on_editor(self):
 
-        import glob
-        base = "/home/xray_juanito/Capstone_Xray_Imaging/captures"
-        files = sorted(glob.glob(base+"/*.jpg") + glob.glob(base+"/*.png"))
+        last = self._latest_capture_path()
 
-        if not files:
+        if last is None:
             QMessageBox.warning(self, "No Images", "None to edit.")
             return
 
-        last = files[-1]
         self.editor_window = ImageEditorWindow(last)
 
         # --- FIX SIZE: force normal window behavior ---
@@ -1002,7 +1699,9 @@ class MainWindow(QMainWindow):
         except Exception as e:
             log_event(f"Error writing shutdown flag: {e}")
 
-        # 2. Turn HV off
+        # 2. Turn HV off (after any in-flight exposure has ended)
+        if self.xray_job is not None:
+            self.xray_job.wait()
         try:
             hv_off()
             log_event("HV OFF for shutdown")
@@ -1010,6 +1709,9 @@ class MainWindow(QMainWindow):
             pass
 
         # 3. Home motors
+        if self.motor_job is not None:
+            self.motor_job.wait()
+
         try:
             motor3_home()
             log_event("Motor3 homed for shutdown")
@@ -1038,26 +1740,47 @@ class MainWindow(QMainWindow):
         if not self.preview_on:
             return
 
-        # PATCH A7 — prevent crashes if backend stopped or not ready
-        if not self.backend.ready:
-            log_event("PATCH A7 — update_frame skipped because backend not ready")
+        gray = self.cam_worker.take_latest()
+        if gray is None:
             return
 
-        try:
-            gray = self.backend.grab_gray()
-        except Exception as e:
-            log_event(f"PATCH A7 — grab_gray failed: {e}")
+        # Nothing on screen to paint into (minimised / fully covered)
+        view = self.view
+        if not view.isVisible() or view.visibleRegion().isEmpty():
             return
 
-        disp = cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
-        h, w = disp.shape[:2]
-        qimg = QImage(disp.data, w, h, 3*w, QImage.Format.Format_BGR888)
-        px = QPixmap.fromImage(qimg).scaled(
-            self.view.size(),
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
+        # Qt draws 8-bit gray natively — wrap the luma view in place.
+        # bytesPerLine = strides[0] skips the row padding without a copy.
+        # QImage borrows the memory, so keep the array alive until the
+        # next frame replaces it.
+        self._last_frame = gray
+        h, w = gray.shape
+        qimg = QImage(
+            sip.voidptr(gray.ctypes.data), w, h, gray.strides[0], _GRAY8
         )
-        self.view.setPixmap(px)
+
+        # Live view: painted straight from the QImage with a fast scale —
+        # no QPixmap copy. Stills still use smooth-scaled pixmaps.
+        view.set_image(qimg)
+
+    # ============================================================
+    # PAUSE PREVIEW GRABS WHILE THE WINDOW IS HIDDEN / MINIMISED
+    # ============================================================
+    def hideEvent(self, event):
+        self.cam_worker.set_active(False)
+        super().hideEvent(event)
+
+    def showEvent(self, event):
+        self.cam_worker.set_active(self.preview_on)
+        super().showEvent(event)
+
+    # ============================================================
+    # VIEW SIZE CACHE — only changes when the label is resized
+    # ============================================================
+    def eventFilter(self, obj, event):
+        if obj is self.view and event.type() == QEvent.Type.Resize:
+            self._view_size = event.size()
+        return super().eventFilter(obj, event)
 
     def update_adc_display(self, v0, hv):
 
@@ -1128,6 +1851,19 @@ class MainWindow(QMainWindow):
         except Exception as e:
             log_event(f"Shutdown: could not write shutdown flag: {e}")
 
+        # Let an in-flight exposure end (its worker turns HV off)
+        if self.xray_job is not None:
+            log_event("Shutdown: waiting for X-ray capture to finish")
+            self.xray_job.wait()
+
+        # Let any in-flight tray move finish before homing
+        if self.motor_job is not None:
+            log_event("Shutdown: waiting for motor job to finish")
+            self.motor_job.wait()
+
+        if self.still_job is not None:
+            self.still_job.wait()
+
         try:
             log_event("Shutdown: Running safety sequence")
 
@@ -1158,12 +1894,25 @@ class MainWindow(QMainWindow):
         # 4. STOP WATCHDOG MODULES & TIMERS
         try: gpio_estop.stop_monitor()
         except: pass
-        try: self.timer.stop()
+        try: GPIO.remove_event_detect(18)
         except: pass
+        if self.switch_watcher is not None:
+            self.switch_watcher.stop()
+            self.switch_watcher.wait()
+        self.cam_worker.set_active(False)
         try: self.adc_timer.stop()
         except: pass
         try: self.align_timer.stop()
         except: pass
+        self.cam_worker.stop()
+        self.cam_worker.wait()
+        self.writer.stop()      # queued captures are still written
+        self.writer.wait()
+
+        if self._hb_mm is not None:
+            try: self._hb_mm.close()
+            except: pass
+            self._hb_mm = None
 
         # 5. Turn off camera + LEDs
         try: self.backend.stop()
@@ -1188,10 +1937,11 @@ def main():
     log_event("GUI started")
 
     # Start required timers
-    win.adc_timer.start()
-    win.align_timer.start()
+    win.start_align_timer()
 
-    sys.exit(app.exec())
+    rc = app.exec()
+    _log_listener.stop()    # drain queued log records before exit
+    sys.exit(rc)
 
 
 if __name__ == "__main__":
@@ -1,5 +1,7 @@
+import os
 import sys
 import time
+import threading
 from pathlib import Path
 
 _here = Path(__file__).resolve()
@@ -18,7 +20,7 @@ from PyQt6.QtWidgets import (
     QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QStatusBar, QMessageBox
 )
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal
 from PyQt6.QtGui import QImage, QPixmap
 
 from xavier.io_utils import capture_and_save_frame
@@ -38,6 +40,9 @@ from xavier.stepper_Motor import (
 
 ser = serial.Serial("/dev/ttyACM0", 115200, timeout=0.01)
 from xavier.camera_picam2 import Picamera2
+from picamera2 import MappedArray
+
+CAPTURE_DIR = "/home/xray_juanito/Capstone_Xray_Imaging/captures"
 
 
 # ============================================================
@@ -50,75 +55,188 @@ class PiCamBackend:
         self.cam: Picamera2 | None = None
         self._mode = "stopped"
 
+        # Serialises the preview worker against GUI-side captures/stops
+        self.lock = threading.RLock()
+
     def start(self):
-        self.cam = Picamera2()
-        self.preview_cfg = self.cam.create_preview_configuration(
-            main={"size": self.preview_size}
-        )
-        self.still_cfg = self.cam.create_still_configuration(
-            main={"size": self.still_size}
-        )
-        self.cam.configure(self.preview_cfg)
-        self.cam.start()
-        self._mode = "preview"
-        time.sleep(0.15)
+        with self.lock:
+            self.cam = Picamera2()
+            # Picamera2 "RGB888" is B,G,R byte order — OpenCV's native layout.
+            # The YUV420 lores stream's Y plane is the grayscale preview.
+            self.preview_cfg = self.cam.create_preview_configuration(
+                main={"size": self.preview_size, "format": "RGB888"},
+                lores={"size": self.preview_size, "format": "YUV420"},
+                display="lores",
+            )
+            self.still_cfg = self.cam.create_still_configuration(
+                main={"size": self.still_size, "format": "RGB888"}
+            )
+            # Fixed X-ray exposure — built once, entered with switch_mode()
+            self.xray_cfg = self.cam.create_still_configuration(
+                main={"size": self.still_size, "format": "RGB888"},
+                controls={
+                    "AnalogueGain": 8.0,
+                    "ExposureTime": 3_000_000,
+                    "AeEnable": False,
+                    "AwbEnable": False
+                }
+            )
+            self.cam.configure(self.preview_cfg)
+            self.cam.start()
+            self._mode = "preview"
+            time.sleep(0.15)
 
     def stop(self):
-        if self.cam:
-            try: self.cam.stop()
-            except: pass
-            try: self.cam.close()
-            except: pass
-        self.cam = None
-        self._mode = "stopped"
-        time.sleep(0.2)
+        with self.lock:
+            if self.cam:
+                try: self.cam.stop()
+                except: pass
+                try: self.cam.close()
+                except: pass
+            self.cam = None
+            self._mode = "stopped"
+            time.sleep(0.2)
+
+    def previewing(self):
+        """True while the camera is streaming the preview config."""
+        return self._mode == "preview"
 
     def grab_gray(self):
-        if self.cam is None:
-            raise RuntimeError("Picamera2 not started")
-        if self._mode != "preview":
-            self.cam.switch_mode(self.preview_cfg)
-            self._mode = "preview"
-            time.sleep(0.05)
-        frame = self.cam.capture_array("main")
-        return cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+        with self.lock:
+            if self.cam is None:
+                raise RuntimeError("Picamera2 not started")
+            if self._mode != "preview":
+                self.cam.switch_mode(self.preview_cfg)
+                self._mode = "preview"
+                time.sleep(0.05)
+            # Copy only the luma rows out of the mapped lores buffer
+            w, h = self.preview_size
+            req = self.cam.capture_request()
+            try:
+                with MappedArray(req, "lores") as m:
+                    return m.array[:h, :w].copy()
+            finally:
+                req.release()
 
     def grab_bgr(self):
-        if self.cam is None:
-            raise RuntimeError("Picamera2 not started")
-        if self._mode != "preview":
-            self.cam.switch_mode(self.preview_cfg)
-            self._mode = "preview"
-            time.sleep(0.05)
-        frame = self.cam.capture_array("main")
-        return cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+        with self.lock:
+            if self.cam is None:
+                raise RuntimeError("Picamera2 not started")
+            if self._mode != "preview":
+                self.cam.switch_mode(self.preview_cfg)
+                self._mode = "preview"
+                time.sleep(0.05)
+            return self.cam.capture_array("main")   # already BGR
+
+    # X-ray exposure is split in two so the GUI can wait out the 3 s
+    # exposure on a QTimer instead of sleeping (see MainWindow.on_xray)
+    XRAY_SETTLE_MS = 3400
+
+    def start_xray_capture(self):
+        with self.lock:
+            if self.cam is None:
+                raise RuntimeError("Picamera2 not started")
+
+            self.cam.switch_mode(self.xray_cfg)
+            self._mode = "xray"
+
+    def finish_xray_capture(self):
+        with self.lock:
+            if self.cam is None:
+                raise RuntimeError("Picamera2 not started")
+            try:
+                frame = self.cam.capture_array("main")
+            finally:
+                self.cam.switch_mode(self.preview_cfg)
+                self._mode = "preview"
+
+            return frame   # already BGR — no channel swap needed
 
     def capture_xray_fixed(self):
-        if self.cam is None:
-            raise RuntimeError("Picamera2 not started")
-
-        cfg = self.cam.create_still_configuration(
-            main={"size": self.still_size},
-            controls={
-                "AnalogueGain": 8.0,
-                "ExposureTime": 3_000_000,
-                "AeEnable": False,
-                "AwbEnable": False
-            }
-        )
+        """Blocking one-shot (scripts); the GUI uses start/finish."""
+        self.start_xray_capture()
+        time.sleep(self.XRAY_SETTLE_MS / 1000)
+        return self.finish_xray_capture()
 
-        self.cam.stop()
-        self.cam.configure(cfg)
-        self.cam.start()
 
-        time.sleep(3.4)
-        frame = self.cam.capture_array("main")
+# ============================================================
+# PREVIEW FRAMES (off the GUI thread)
+# ============================================================
+class CameraWorker(QThread):
+    """Pulls preview frames off the GUI thread; the GUI paints the newest.
+
+    Only one frame_ready is ever queued — if the GUI falls behind, the
+    pending frame is simply replaced by a newer one.
+    """
+    frame_ready = pyqtSignal()
+    running = True
+
+    def __init__(self, backend, parent=None):
+        super().__init__(parent)
+        self.backend = backend
+        self.active = False          # preview on/off (use set_active)
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._latest = None
+        self._pending = False
+
+    def run(self):
+        while self.running:
+            with self.backend.lock:
+                # Never grab mid-exposure or after STOP — grab_gray()
+                # would switch the camera back to preview
+                live = self.active and self.backend.previewing()
+                if live:
+                    try:
+                        gray = self.backend.grab_gray()
+                    except Exception as e:
+                        print("[CAMERA] grab failed:", e)
+                        live = False
+
+            if not live:
+                self._wake.wait(0.5)
+                self._wake.clear()
+                continue
+
+            with self._lock:
+                self._latest = gray
+                notify = not self._pending
+                self._pending = True
+            if notify:
+                self.frame_ready.emit()
+
+    def set_active(self, on):
+        self.active = on
+        self._wake.set()
+
+    def take_latest(self):
+        with self._lock:
+            frame, self._latest = self._latest, None
+            self._pending = False
+        return frame
 
-        self.cam.stop()
-        self.cam.configure(self.preview_cfg)
-        self.cam.start()
+    def stop(self):
+        self.running = False
+        self._wake.set()
 
-        return cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+
+# ============================================================
+# CAPTURE SAVE (off the GUI thread)
+# ============================================================
+class SaveWorker(QThread):
+    """JPEG-encode and write one capture so the GUI doesn't stall."""
+    def __init__(self, filename, img, parent=None):
+        super().__init__(parent)
+        self.filename = filename
+        self.img = img
+
+    def run(self):
+        try:
+            # imwrite reports a bad path / full disk by returning False
+            if not cv2.imwrite(self.filename, self.img, [cv2.IMWRITE_JPEG_QUALITY, 90]):
+                raise RuntimeError(f"could not write {self.filename}")
+        except Exception as e:
+            print("SAVE ERROR:", e)
 
 
 
@@ -127,6 +245,15 @@ class PiCamBackend:
 # ============================================================
 class MainWindow(QMainWindow):
 
+    # Banner stylesheets, built once — banner() only re-applies on change
+    _BANNER_STYLES = {
+        "green":  "background-color:#4CAF50;color:white;font-size:26px;font-weight:bold;padding:8px;",
+        "blue":   "background-color:#2196F3;color:white;font-size:26px;font-weight:bold;padding:8px;",
+        "yellow": "background-color:#FFEB3B;color:black;font-size:26px;font-weight:bold;padding:8px;",
+        "red":    "background-color:#F44336;color:white;font-size:26px;font-weight:bold;padding:8px;",
+        None:     "font-size:26px;font-weight:bold;padding:8px;",
+    }
+
     def __init__(self):
         super().__init__()
 
@@ -142,6 +269,11 @@ class MainWindow(QMainWindow):
         self.has_closed_once = False
         self.has_started = False
         self.hv_active = False     # <---- ADC only on when HV ON
+        self._xray_in_progress = False
+        self._last_align_state = None
+        self._save_jobs = set()
+        self._cap_cache = None
+        self._cap_cache_mtime = None
 
         GPIO.setmode(GPIO.BCM)
         GPIO.setup(18, GPIO.IN, pull_up_down=GPIO.PUD_UP)
@@ -157,11 +289,20 @@ class MainWindow(QMainWindow):
             print("[CAMERA] FAILED:", e)
             self.camera_ok = False
 
+        # Preview grabs run on CameraWorker; the GUI only paints
+        self.cam_worker = CameraWorker(self.backend, self)
+        self.cam_worker.frame_ready.connect(
+            self.update_frame, Qt.ConnectionType.QueuedConnection
+        )
+        if self.camera_ok:
+            self.cam_worker.start()
+
         # -------------------------------------------------
         # UI
         # -------------------------------------------------
         self.alarm = QLabel("System Ready", alignment=Qt.AlignmentFlag.AlignCenter)
-        self.alarm.setStyleSheet("font-size:26px;font-weight:bold;padding:8px;")
+        self._cur_style = self._BANNER_STYLES[None]
+        self.alarm.setStyleSheet(self._cur_style)
 
         self.view = QLabel("Camera", alignment=Qt.AlignmentFlag.AlignCenter)
 
@@ -213,55 +354,57 @@ class MainWindow(QMainWindow):
         self.btn_show_last.clicked.connect(self.on_show_last)
         self.btn_editor.clicked.connect(self.on_editor)
 
-        # Timers
-        self.timer = QTimer(self)
-        self.timer.setInterval(33)
-        self.timer.timeout.connect(self.update_frame)
-
-        self.adc_timer = QTimer(self)
-        self.adc_timer.setInterval(300)
-        self.adc_timer.timeout.connect(self.check_adc_safety)
-        self.adc_timer.start()
-
-        self.align_timer = QTimer(self)
-        self.align_timer.setInterval(100)
-        self.align_timer.timeout.connect(self.check_alignment)
-        self.align_timer.start()
+        # Timer — one 33 ms tick drives alignment (every 3rd) and ADC
+        # (every 9th), so a single wake services both
+        self._n = 0
+        self.tick = QTimer(self)
+        self.tick.setInterval(33)
+        self.tick.timeout.connect(self._on_tick)
+        self.tick.start()
 
         start_watchdog()
         self.all_leds_off()
 
 
+    # ============================================================
+    def _on_tick(self):
+        if self._n % 3 == 0:
+            # Sole watchdog kick — ~10 Hz is plenty for a multi-second timeout
+            heartbeat()
+            self.check_alignment()
+        if self._n % 9 == 0:
+            self.check_adc_safety()
+        self._n += 1
+
+
+    # ============================================================
+    def _set_motion_buttons(self, enabled):
+        for b in (self.btn_open, self.btn_close,
+                  self.btn_rotate, self.btn_home3, self.btn_xray):
+            b.setEnabled(enabled)
+
+
     # ============================================================
     def all_leds_off(self):
-        self.leds.write(self.leds.red, False)
-        self.leds.write(self.leds.amber, False)
-        self.leds.write(self.leds.green, False)
-        self.leds.write(self.leds.blue, False)
+        self.leds.set_all(False, False, False, False)
+        self._last_align_state = None   # display no longer shows alignment
 
 
     # ============================================================
     def banner(self, text, color=None):
-        if color == "green":
-            st = "background-color:#4CAF50;color:white;font-size:26px;font-weight:bold;padding:8px;"
-        elif color == "blue":
-            st = "background-color:#2196F3;color:white;font-size:26px;font-weight:bold;padding:8px;"
-        elif color == "yellow":
-            st = "background-color:#FFEB3B;color:black;font-size:26px;font-weight:bold;padding:8px;"
-        elif color == "red":
-            st = "background-color:#F44336;color:white;font-size:26px;font-weight:bold;padding:8px;"
-        else:
-            st = "font-size:26px;font-weight:bold;padding:8px;"
-        self.alarm.setStyleSheet(st)
-        self.alarm.setText(text)
+        self._last_align_state = None   # next check_alignment redraws
+        st = self._BANNER_STYLES.get(color, self._BANNER_STYLES[None])
+        if st is not self._cur_style:
+            self.alarm.setStyleSheet(st)
+            self._cur_style = st
+        if self.alarm.text() != text:
+            self.alarm.setText(text)
 
 
     # ============================================================
     # ADC SAFETY — ONLY WHEN HV ACTIVE
     # ============================================================
     def check_adc_safety(self):
-        heartbeat()
-
         if not self.hv_active:
             return
 
@@ -272,6 +415,7 @@ class MainWindow(QMainWindow):
             hv_off()
             self.hv_active = False
             self.hv_fault_active = True
+            self._xray_in_progress = False   # pending X-ray steps stand down
 
             self.all_leds_off()
             self.leds.write(self.leds.red, True)
@@ -293,26 +437,26 @@ class MainWindow(QMainWindow):
     # ALIGNMENT
     # ============================================================
     def check_alignment(self):
-        heartbeat()
-
         if self.hv_fault_active:
             return
 
+        # Only touch LEDs/banner when the inputs actually changed
+        sw2 = GPIO.input(18)
+        state = (self.has_started, self.has_closed_once, sw2)
+        if state == self._last_align_state:
+            return
+
         if not self.has_started:
             self.all_leds_off()
             self.banner("System Ready")
-            return
 
-        if not self.has_closed_once:
+        elif not self.has_closed_once:
             self.armed = False
             self.all_leds_off()
             self.leds.write(self.leds.amber, True)
             self.banner("Tray Open — Insert Sample", color="yellow")
-            return
 
-        sw2 = GPIO.input(18)
-
-        if sw2 == 0:
+        elif sw2 == 0:
             self.armed = True
             self.all_leds_off()
             self.leds.write(self.leds.green, True)
@@ -323,14 +467,15 @@ class MainWindow(QMainWindow):
             self.leds.write(self.leds.amber, True)
             self.banner("Tray Closing…", color="yellow")
 
+        # Recorded last: the writes above invalidate the cache themselves
+        self._last_align_state = state
+
 
     # ============================================================
     # OPEN
     # ============================================================
     def on_open(self):
-        heartbeat()
-
-        if self.hv_fault_active:
+        if self.hv_fault_active or self._xray_in_progress:
             return
 
         self.has_started = True
@@ -349,9 +494,7 @@ class MainWindow(QMainWindow):
     # CLOSE
     # ============================================================
     def on_close(self):
-        heartbeat()
-
-        if self.hv_fault_active:
+        if self.hv_fault_active or self._xray_in_progress:
             return
 
         self.has_started = True
@@ -365,15 +508,13 @@ class MainWindow(QMainWindow):
 
     # ============================================================
     def on_rotate45(self):
-        heartbeat()
-        if not self.hv_fault_active:
+        if not self.hv_fault_active and not self._xray_in_progress:
             motor3_rotate_45()
 
 
     # ============================================================
     def on_home3(self):
-        heartbeat()
-        if not self.hv_fault_active:
+        if not self.hv_fault_active and not self._xray_in_progress:
             motor3_home()
 
 
@@ -381,7 +522,8 @@ class MainWindow(QMainWindow):
     # XRAY (HV even without camera)
     # ============================================================
     def on_xray(self):
-        heartbeat()
+        if self._xray_in_progress:
+            return
 
         if self.hv_fault_active:
             QMessageBox.warning(self, "HV Fault", "Unsafe HV level detected.")
@@ -395,31 +537,66 @@ class MainWindow(QMainWindow):
         self.all_leds_off()
         self.leds.write(self.leds.blue, True)
         self.banner("HV On — Taking X-Ray", color="blue")
-        QApplication.processEvents()
 
+        # HV settle (400 ms) and exposure run as QTimer steps, so the tick
+        # (ADC safety, heartbeat) keeps firing and can abort mid-shot.
+        # No tray/rotation moves while HV is on — they would also block
+        # the tick for their whole travel
+        self._xray_in_progress = True
+        self._set_motion_buttons(False)
         try:
             # Enable HV safety window
             self.hv_active = True
             hv_on()
-            time.sleep(0.4)
+        except Exception as e:
+            self._xray_fail(e)
+            return
+        QTimer.singleShot(400, self._xray_expose)
+
+    def _xray_expose(self):
+        if not self._xray_in_progress:      # aborted by ADC fault
+            return
 
-            # CAMERA OPTIONAL MODE
-            if self.camera_ok:
-                img = self.backend.capture_xray_fixed()
-            else:
-                img = None
+        # CAMERA OPTIONAL MODE
+        if not self.camera_ok:
+            self._xray_done(None)
+            return
 
+        try:
+            self.backend.start_xray_capture()
         except Exception as e:
-            hv_off()
-            self.hv_active = False
-            QMessageBox.critical(self, "Error",
-                                 "Camera/HV error — HV turned OFF safely.")
-            print("XRAY ERROR:", e)
+            self._xray_fail(e)
             return
+        QTimer.singleShot(self.backend.XRAY_SETTLE_MS, self._xray_collect)
 
-        finally:
-            hv_off()
-            self.hv_active = False
+    def _xray_collect(self):
+        # Always read out so the camera returns to preview, even if aborted
+        try:
+            img = self.backend.finish_xray_capture()
+        except Exception as e:
+            if self._xray_in_progress:
+                self._xray_fail(e)
+            return
+
+        if not self._xray_in_progress:
+            return
+        self._xray_done(img)
+
+    def _xray_fail(self, e):
+        hv_off()
+        self.hv_active = False
+        self._xray_in_progress = False
+        self.all_leds_off()                 # blue "HV On" is no longer true
+        self._set_motion_buttons(not self.hv_fault_active)
+        QMessageBox.critical(self, "Error",
+                             "Camera/HV error — HV turned OFF safely.")
+        print("XRAY ERROR:", e)
+
+    def _xray_done(self, img):
+        hv_off()
+        self.hv_active = False
+        self._xray_in_progress = False
+        self._set_motion_buttons(True)
 
         # After HV cycle
         self.all_leds_off()
@@ -428,14 +605,15 @@ class MainWindow(QMainWindow):
 
         # Save only if camera exists
         if img is not None:
-            filename = f"/home/xray_juanito/Capstone_Xray_Imaging/captures/capture_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jpg"
-            cv2.imwrite(filename, img)
+            filename = f"{CAPTURE_DIR}/capture_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jpg"
+            job = SaveWorker(filename, img, self)
+            self._save_jobs.add(job)
+            job.finished.connect(lambda j=job: self._save_jobs.discard(j))
+            job.start()
 
 
     # ============================================================
     def on_show_last(self):
-        heartbeat()
-
         if self.hv_fault_active:
             return
 
@@ -443,9 +621,7 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self,"Preview Active","Turn OFF preview first.")
             return
 
-        import glob
-        base = "/home/xray_juanito/Capstone_Xray_Imaging/captures"
-        files = sorted(glob.glob(base+"/*.jpg") + glob.glob(base+"/*.png"))
+        files = self._list_captures()
 
         if not files:
             QMessageBox.warning(self,"No Images","None found.")
@@ -466,9 +642,24 @@ class MainWindow(QMainWindow):
 
 
     # ============================================================
-    def on_preview(self):
-        heartbeat()
+    def _list_captures(self):
+        """Sorted capture paths; one scandir pass, re-read only when the
+        directory changes (new saves bump its mtime)."""
+        try:
+            mtime = os.stat(CAPTURE_DIR).st_mtime_ns
+        except FileNotFoundError:
+            return []
+        if self._cap_cache is None or mtime != self._cap_cache_mtime:
+            with os.scandir(CAPTURE_DIR) as it:
+                entries = [e.path for e in it if e.name.endswith((".jpg", ".png"))]
+            entries.sort()
+            self._cap_cache = entries
+            self._cap_cache_mtime = mtime
+        return self._cap_cache
+
 
+    # ============================================================
+    def on_preview(self):
         if not self.camera_ok:
             QMessageBox.warning(
                 self, "Camera Missing",
@@ -476,20 +667,23 @@ class MainWindow(QMainWindow):
             )
             return
 
-        if not self.preview_on:
-            self.preview_on=True
-            self.timer.start()
-        else:
-            self.preview_on=False
-            self.timer.stop()
+        self.preview_on = not self.preview_on
+        self.cam_worker.set_active(self.preview_on)
 
 
     # ============================================================
     def on_stop(self):
-        heartbeat()
-
         self.preview_on=False
-        self.timer.stop()
+        self.cam_worker.set_active(False)
+
+        # STOP always drops HV; a shot in progress stands down (its pending
+        # QTimer steps see _xray_in_progress cleared)
+        try: hv_off()
+        except: pass
+        self.hv_active = False
+        if self._xray_in_progress:
+            self._xray_in_progress = False
+            self._set_motion_buttons(not self.hv_fault_active)
 
         if self.backend:
             try: self.backend.stop()
@@ -501,21 +695,17 @@ class MainWindow(QMainWindow):
 
     # ============================================================
     def update_frame(self):
-        heartbeat()
-
-        if not self.preview_on:
+        # Newest frame from CameraWorker — the grab never runs here
+        gray = self.cam_worker.take_latest()
+        if gray is None or not self.preview_on:
             return
-        if not self.camera_ok:
+        if self._xray_in_progress:   # keep the view still during the shot
             return
 
-        try:
-            gray = self.backend.grab_gray()
-        except:
-            return
-
-        disp = cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
-        h,w = disp.shape[:2]
-        qimg = QImage(disp.data, w, h, 3*w, QImage.Format.Format_BGR888)
+        # Paint the single-channel frame as-is — no 3x GRAY2BGR expansion.
+        # fromImage() below copies, so `gray` need not outlive this call.
+        h,w = gray.shape[:2]
+        qimg = QImage(gray.data, w, h, gray.strides[0], QImage.Format.Format_Grayscale8)
         px = QPixmap.fromImage(qimg).scaled(
             self.view.size(),
             Qt.AspectRatioMode.KeepAspectRatio,
@@ -526,8 +716,6 @@ class MainWindow(QMainWindow):
 
     # ============================================================
     def on_export(self):
-        heartbeat()
-
         if not self.camera_ok:
             QMessageBox.warning(self, "Camera Missing",
                                 "Cannot export — no camera connected.")
@@ -543,25 +731,18 @@ class MainWindow(QMainWindow):
 
     # ============================================================
     def on_gallery(self):
-        heartbeat()
-
-        base_dir = Path("/home/xray_juanito/Capstone_Xray_Imaging/captures")
-        all_imgs = sorted(list(base_dir.glob("*.jpg")) + list(base_dir.glob("*.png")))
+        all_imgs = self._list_captures()
 
         if not all_imgs:
             QMessageBox.information(self,"Gallery","No images found.")
             return
 
-        Gallery([str(p) for p in all_imgs]).run()
+        Gallery(list(all_imgs)).run()
 
 
     # ============================================================
     def on_editor(self):
-        heartbeat()
-
-        import glob
-        base="/home/xray_juanito/Capstone_Xray_Imaging/captures"
-        files = sorted(glob.glob(base+"/*.jpg") + glob.glob(base+"/*.png"))
+        files = self._list_captures()
 
         if not	files:
             QMessageBox.warning(self,"No Images","None to edit.")
@@ -579,16 +760,22 @@ class MainWindow(QMainWindow):
 
         print("[CLOSE] Safe shutdown…")
 
-        try: self.timer.stop()
-        except: pass
-        try: self.adc_timer.stop()
-        except: pass
-        try: self.align_timer.stop()
+        try: self.tick.stop()
         except: pass
 
+        try:
+            self.cam_worker.stop()
+            self.cam_worker.wait()
+        except:
+            pass
+
         try: hv_off()
         except: pass
 
+        # Let pending capture writes land
+        for job in list(self._save_jobs):
+            job.wait()
+
         try:
             if self.backend:
                 self.backend.stop()
@@ -3,6 +3,8 @@ import time
 import logging
 from logging.handlers import RotatingFileHandler
 import os
+import mmap
+import struct
 import multiprocessing
 
 #Clean input 
@@ -67,15 +69,38 @@ def safe_shutdown_requested() -> bool:
 # ======================================================
 # GUI HEARTBEAT CHECK
 # ======================================================
+# The GUI keeps an 8-byte little-endian double (time.time()) in
+# HEARTBEAT_FILE, updated in place through mmap. Map it once and re-map
+# only if the file is recreated (new inode).
+_hb_mm = None
+_hb_ino = None
+
+def _heartbeat_map():
+    global _hb_mm, _hb_ino
+    st = os.stat(HEARTBEAT_FILE)
+    if _hb_mm is None or st.st_ino != _hb_ino:
+        if _hb_mm is not None:
+            _hb_mm.close()
+            _hb_mm = None
+        if st.st_size < 8:
+            return None
+        with open(HEARTBEAT_FILE, "rb") as f:
+            _hb_mm = mmap.mmap(f.fileno(), 8, prot=mmap.PROT_READ)
+        _hb_ino = st.st_ino
+    return _hb_mm
+
+
 def gui_is_alive():
     try:
         if not os.path.exists(HEARTBEAT_FILE):
             return False
-        
-        with open(HEARTBEAT_FILE, "r") as f:
-            ts = float(f.read().strip())
 
-        return (time.time() - ts) < HEARTBEAT_TIMEOUT
+        mm = _heartbeat_map()
+        if mm is None:
+            return False
+        (ts,) = struct.unpack_from("<d", mm, 0)
+
+        return 0 <= (time.time() - ts) < HEARTBEAT_TIMEOUT
 
     except Exception as e:
         log(f"Heartbeat read error: {e}")
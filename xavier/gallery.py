@@ -134,6 +134,10 @@ class Gallery:
 
         self._last_processed: Optional[np.ndarray] = None
 
+        # Decoded image for self.idx — zoom/contrast keys reuse it
+        self._decoded_idx: Optional[int] = None
+        self._decoded: Optional[np.ndarray] = None
+
     # ---------------- USER ACTION HOOK ----------------
     def open_in_editor(self):
         """
@@ -166,8 +170,11 @@ class Gallery:
         self.alpha, self.beta, self.zoom = 1.0, 0.0, 1.0
 
     def _load(self, i: int) -> Optional[np.ndarray]:
-        path = self.files[i]
-        return cv2.imread(path, cv2.IMREAD_COLOR)
+        """Decode image i once; repeated renders of the same index hit the cache."""
+        if i != self._decoded_idx:
+            self._decoded = cv2.imread(self.files[i], cv2.IMREAD_COLOR)
+            self._decoded_idx = i
+        return self._decoded
 
     def _render_current(self) -> np.ndarray:
         path = self.files[self.idx]
@@ -1,5 +1,12 @@
 import RPi.GPIO as GPIO
 
+# lgpio talks to the gpiochip character device directly — much cheaper
+# per write than RPi.GPIO. Optional: fall back to RPi.GPIO if missing.
+try:
+    import lgpio
+except ImportError:
+    lgpio = None
+
 class LedPanel:
     """
     LED policy:
@@ -18,12 +25,59 @@ class LedPanel:
 
         GPIO.setmode(GPIO.BCM)
 
-        for p in (self.red, self.amber, self.green, self.blue):
-            GPIO.setup(p, GPIO.OUT)
-            GPIO.output(p, GPIO.LOW)
+        # Last level written per pin — write() skips no-op GPIO calls
+        self._state = {}
+
+        pins = (self.red, self.amber, self.green, self.blue)
+
+        self._h = None
+        if lgpio is not None:
+            try:
+                self._h = lgpio.gpiochip_open(0)
+                for p in pins:
+                    lgpio.gpio_claim_output(self._h, p, 0)
+            except Exception:
+                # Busy pin / wrong gpiochip — release and use RPi.GPIO
+                if self._h is not None:
+                    try:
+                        lgpio.gpiochip_close(self._h)
+                    except Exception:
+                        pass
+                self._h = None
+
+        for p in pins:
+            if self._h is None:
+                GPIO.setup(p, GPIO.OUT)
+                GPIO.output(p, GPIO.LOW)
+            self._state[p] = False
 
     def write(self, pin: int, value: bool):
-        GPIO.output(pin, GPIO.HIGH if value else GPIO.LOW)
+        value = bool(value)
+        if self._state.get(pin) == value:
+            return
+        if self._h is not None:
+            lgpio.gpio_write(self._h, pin, 1 if value else 0)
+        else:
+            GPIO.output(pin, GPIO.HIGH if value else GPIO.LOW)
+        self._state[pin] = value
+
+    def set_all(self, red: bool, amber: bool, green: bool, blue: bool):
+        """Set all four LEDs; only changed pins are written, in one call."""
+        pins, vals = [], []
+        for pin, value in ((self.red, red), (self.amber, amber),
+                           (self.green, green), (self.blue, blue)):
+            value = bool(value)
+            if self._state.get(pin) != value:
+                pins.append(pin)
+                vals.append(value)
+                self._state[pin] = value
+        if not pins:
+            return
+        if self._h is not None:
+            for pin, value in zip(pins, vals):
+                lgpio.gpio_write(self._h, pin, 1 if value else 0)
+        else:
+            GPIO.output(pins, [GPIO.HIGH if v else GPIO.LOW for v in vals])
 
     def apply(self, *, alarm: bool, interlocks_ok: bool, state: str):
         """
@@ -35,10 +89,16 @@ class LedPanel:
         green = (state == "ARMED") and interlocks_ok
         blue  = state in ("EXPOSE", "PREVIEW")
 
-        self.write(self.red, red)
-        self.write(self.amber, amber)
-        self.write(self.green, green)
-        self.write(self.blue, blue)
+        self.set_all(red, amber, green, blue)
 
     def cleanup(self):
+        if self._h is not None:
+            for p in (self.red, self.amber, self.green, self.blue):
+                try:
+                    lgpio.gpio_write(self._h, p, 0)
+                    lgpio.gpio_free(self._h, p)
+                except Exception:
+                    pass
+            lgpio.gpiochip_close(self._h)
+            self._h = None
         GPIO.cleanup()
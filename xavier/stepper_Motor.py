@@ -3,8 +3,17 @@
 # ============================================================
 import RPi.GPIO as GPIO
 import time
+import threading
 import serial
 
+# pigpio's DMA waveform engine times fixed-length stepper moves in
+# hardware (no Python sleep jitter). Optional: needs the pigpiod daemon;
+# without it every move uses the Python step loop.
+try:
+    import pigpio
+except ImportError:
+    pigpio = None
+
 # ============================================================
 #  SERIAL FOR MOTOR 1 (DRV8825 THROUGH ARDUINO)
 # ============================================================
@@ -14,6 +23,36 @@ import serial
 
 ser = serial.Serial("/dev/ttyACM0", 115200, timeout=0.01)
 
+# One writer at a time: motor jobs run on worker threads, shutdown homing
+# runs on the GUI thread — never interleave bytes on the Arduino link.
+SERIAL_LOCK = threading.Lock()
+
+
+def _serial_write(cmd: bytes):
+    with SERIAL_LOCK:
+        ser.write(cmd)
+
+
+# Motor 1 pulses go out M1_BATCH per write (one USB frame) at the same
+# overall rate of one command per M1_PERIOD. The limit is only checked
+# between writes, so keep this at 1 (no overrun, even step timing) until
+# the controller firmware can end a run on the limit itself.
+M1_BATCH = 1
+M1_PERIOD = 0.002
+_M1F_BATCH = b"M1F\n" * M1_BATCH
+_M1B_BATCH = b"M1B\n" * M1_BATCH
+
+
+# Set by the GUI on E-STOP: every motor loop checks it between steps and
+# bails out, so a move never outlives the stop. Clear it on release.
+ABORT = threading.Event()
+
+
+def _check_abort():
+    if ABORT.is_set():
+        raise RuntimeError("motion aborted (E-STOP)")
+
+
 # Motor 1 limit switches
 SW1 = 17   # OPEN limit
 SW2 = 18   # CLOSE limit
@@ -23,6 +62,53 @@ GPIO.setup(SW1, GPIO.IN, pull_up_down=GPIO.PUD_UP)
 GPIO.setup(SW2, GPIO.IN, pull_up_down=GPIO.PUD_UP)
 
 
+# ------------------------------------------------------------
+#  LIMIT SWITCH EDGES
+#  A move loop checks an Event set from an edge callback instead of
+#  calling GPIO.input() every iteration. Armed on first use, so the GUI's
+#  own switch watcher (libgpiod or RPi.GPIO) gets the pins first; when
+#  edges can't be had the loop simply polls the level as before.
+# ------------------------------------------------------------
+_LIMIT_HIT = {}             # pin -> Event, or None = poll
+LIMIT_RECHECK = 8           # also re-read the level every N iterations
+
+
+def _on_limit(ch):
+    if GPIO.input(ch) == 0:         # pressed (edge may be the release)
+        ev = _LIMIT_HIT.get(ch)
+        if ev is not None:
+            ev.set()
+
+
+def _limit_event(pin):
+    """Return a cleared Event for `pin` (set if already pressed), or None."""
+    if pin not in _LIMIT_HIT:
+        ev = threading.Event()
+        try:
+            GPIO.add_event_detect(pin, GPIO.BOTH, bouncetime=20)
+        except Exception:
+            pass    # already detecting (GUI watches SW2) — share it
+        try:
+            GPIO.add_event_callback(pin, _on_limit)
+        except Exception:
+            ev = None   # pin owned elsewhere (e.g. libgpiod) — poll
+        _LIMIT_HIT[pin] = ev
+
+    ev = _LIMIT_HIT[pin]
+    if ev is not None:
+        ev.clear()
+        if GPIO.input(pin) == 0:
+            ev.set()
+    return ev
+
+
+def _limit_reached(pin, ev, n):
+    # The periodic level read covers an edge lost to contact bounce
+    if ev is None or n % LIMIT_RECHECK == 0:
+        return GPIO.input(pin) == 0
+    return ev.is_set()
+
+
 # ============================================================
 # MOTOR 1 — FUNCTIONS
 # ============================================================
@@ -30,9 +116,16 @@ def motor1_forward_until_switch2():
     """CLOSE until SW2 pressed"""
     print("Motor1 → FORWARD (close) until Switch2...")
 
-    while GPIO.input(SW2) == 1:   # 1 = NOT pressed
-        ser.write(b"M1F\n")
-        time.sleep(0.002)
+    ev = _limit_event(SW2)
+    n = 0
+    while not _limit_reached(SW2, ev, n):
+        _check_abort()
+        _serial_write(_M1F_BATCH)
+        if ev is not None:
+            ev.wait(M1_PERIOD * M1_BATCH)
+        else:
+            time.sleep(M1_PERIOD * M1_BATCH)
+        n += 1
 
     print("Switch2 hit.")
 
@@ -41,9 +134,16 @@ def motor1_backward_until_switch1():
     """OPEN until SW1 pressed"""
     print("Motor1 → BACKWARD (open) until Switch1...")
 
-    while GPIO.input(SW1) == 1:
-        ser.write(b"M1B\n")
-        time.sleep(0.002)
+    ev = _limit_event(SW1)
+    n = 0
+    while not _limit_reached(SW1, ev, n):
+        _check_abort()
+        _serial_write(_M1B_BATCH)
+        if ev is not None:
+            ev.wait(M1_PERIOD * M1_BATCH)
+        else:
+            time.sleep(M1_PERIOD * M1_BATCH)
+        n += 1
 
     print("Switch1 hit.")
 
@@ -79,6 +179,76 @@ SEQ = [
     [1,0,0,1]
 ]
 
+# Coil levels per SEQ entry as tuples, built once: each step is a single
+# list-form GPIO.output() call instead of four per-pin calls
+SEQ_LEVELS = tuple(tuple(GPIO.HIGH if v else GPIO.LOW for v in pat) for pat in SEQ)
+
+M2_PINS = (IN1, IN2, IN3, IN4)
+
+
+def _seq_masks(pins):
+    """(set_mask, clear_mask) per SEQ entry, for pigpio bank writes."""
+    return tuple(
+        (sum(1 << p for p, v in zip(pins, pat) if v),
+         sum(1 << p for p, v in zip(pins, pat) if not v))
+        for pat in SEQ
+    )
+
+
+M2_MASKS = _seq_masks(M2_PINS)
+
+_pi = None
+if pigpio is not None:
+    try:
+        _pi = pigpio.pi()
+        if not _pi.connected:
+            _pi = None
+    except Exception:
+        _pi = None
+
+
+def _wave_run(masks, index, direction, steps, delay_s):
+    """Play `steps` half-steps from `index` as a DMA waveform.
+
+    Returns the number of steps emitted — fewer than `steps` only if
+    ABORT stopped the wave (estimated from elapsed time; DMA timing is
+    exact, so this is good to a step or so).
+    """
+    if steps <= 0:
+        return 0
+    us = int(delay_s * 1e6)
+    pulses = [
+        pigpio.pulse(*masks[(index + direction * (k + 1)) % 8], us)
+        for k in range(8)
+    ]
+    full, rest = divmod(steps, 8)
+
+    _pi.wave_clear()
+    chain = []
+    if full:
+        _pi.wave_add_generic(pulses)
+        chain += [255, 0, _pi.wave_create(), 255, 1, full & 0xFF, full >> 8]
+    if rest:
+        _pi.wave_add_generic(pulses[:rest])
+        chain.append(_pi.wave_create())
+
+    t0 = time.monotonic()
+    _pi.wave_chain(chain)
+    try:
+        while _pi.wave_tx_busy():
+            if ABORT.is_set():
+                _pi.wave_tx_stop()
+                return min(steps, int((time.monotonic() - t0) / delay_s))
+            time.sleep(0.01)
+        return steps
+    finally:
+        _pi.wave_clear()
+
+
+def _use_wave(steps):
+    # wave_chain loop counts are 16-bit
+    return _pi is not None and steps // 8 <= 0xFFFF
+
 STEP_SLEEP = 0.0015
 m2_index = 0
 
@@ -86,11 +256,9 @@ m2_index = 0
 def motor2_step(direction):
     """direction: +1 = clockwise, -1 = counterclockwise"""
     global m2_index
-    pins = [IN1, IN2, IN3, IN4]
     m2_index = (m2_index + direction) % 8
 
-    for i in range(4):
-        GPIO.output(pins[i], SEQ[m2_index][i])
+    GPIO.output(M2_PINS, SEQ_LEVELS[m2_index])
 
     time.sleep(STEP_SLEEP)
 
@@ -100,7 +268,9 @@ def motor2_home_to_limit3():
     print("Motor2 → Homing to Switch3…")
     steps_taken = 0
 
-    while GPIO.input(LIMIT3) == 1:   # NOT pressed
+    ev = _limit_event(LIMIT3)
+    while not _limit_reached(LIMIT3, ev, steps_taken):
+        _check_abort()
         motor2_step(+1)
         steps_taken += 1
 
@@ -110,10 +280,19 @@ def motor2_home_to_limit3():
 
 def motor2_move_full_up():
     """Move full travel"""
+    global m2_index
     print(f"Motor2 → moving {FULL_TRAVEL_STEPS} steps upward…")
 
-    for _ in range(FULL_TRAVEL_STEPS):
-        motor2_step(-1)
+    if _use_wave(FULL_TRAVEL_STEPS):
+        _check_abort()
+        done = _wave_run(M2_MASKS, m2_index, -1, FULL_TRAVEL_STEPS, STEP_SLEEP)
+        m2_index = (m2_index - done) % 8
+        if done < FULL_TRAVEL_STEPS:
+            _check_abort()
+    else:
+        for _ in range(FULL_TRAVEL_STEPS):
+            _check_abort()
+            motor2_step(-1)
 
     print("Motor2 full travel complete.")
 
@@ -121,13 +300,14 @@ def motor2_move_full_up():
 # ============================================================
 #  MOTOR 3 — 45° ROTATION + HOME (ULN2003)
 # ============================================================
-M3_PINS = [16, 6, 5, 25]
+M3_PINS = (16, 6, 5, 25)
 for p in M3_PINS:
     GPIO.setup(p, GPIO.OUT)
     GPIO.output(p, 0)
 
 # Your existing ULN2003 half-step sequence
-M3_SEQ = SEQ      
+M3_SEQ = SEQ_LEVELS
+M3_MASKS = _seq_masks(M3_PINS)
 M3_SLEEP = 0.002
 M3_STEPS_45 = 512
 
@@ -142,8 +322,7 @@ def motor3_step_forward():
     global m3_index
     m3_index = (m3_index + 1) % 8
 
-    for pin, val in zip(M3_PINS, M3_SEQ[m3_index]):
-        GPIO.output(pin, val)
+    GPIO.output(M3_PINS, M3_SEQ[m3_index])
 
     time.sleep(M3_SLEEP)
 
@@ -155,8 +334,7 @@ def motor3_step_backward():
     global m3_index
     m3_index = (m3_index - 1) % 8
 
-    for pin, val in zip(M3_PINS, M3_SEQ[m3_index]):
-        GPIO.output(pin, val)
+    GPIO.output(M3_PINS, M3_SEQ[m3_index])
 
     time.sleep(M3_SLEEP)
 
@@ -165,18 +343,27 @@ def motor3_step_backward():
 #  ROTATE +45°
 # ------------------------------------------------------------
 def motor3_rotate_45():
-    global m3_total_steps
+    global m3_total_steps, m3_index
 
     print("Motor3 → 45° rotation")
 
-    for _ in range(M3_STEPS_45):
-        motor3_step_forward()
-
-    m3_total_steps += M3_STEPS_45
-
-    # turn all coils OFF
-    for pin in M3_PINS:
-        GPIO.output(pin, 0)
+    # Count per step so an aborted move still homes back exactly
+    try:
+        if _use_wave(M3_STEPS_45):
+            _check_abort()
+            done = _wave_run(M3_MASKS, m3_index, +1, M3_STEPS_45, M3_SLEEP)
+            m3_index = (m3_index + done) % 8
+            m3_total_steps += done
+            if done < M3_STEPS_45:
+                _check_abort()
+        else:
+            for _ in range(M3_STEPS_45):
+                _check_abort()
+                motor3_step_forward()
+                m3_total_steps += 1
+    finally:
+        # turn all coils OFF
+        GPIO.output(M3_PINS, GPIO.LOW)
 
     print(f"Motor3 → done. Total steps = {m3_total_steps}")
 
@@ -186,17 +373,28 @@ def motor3_rotate_45():
 #  Move EXACT number of steps backward to return to zero.
 # ------------------------------------------------------------
 def motor3_home():
-    global m3_total_steps
+    global m3_total_steps, m3_index
 
     print("Motor3 → HOMING...")
 
     # reverse all steps taken so far
-    for _ in range(m3_total_steps):
-        motor3_step_backward()
-
-    # turn off coils
-    for pin in M3_PINS:
-        GPIO.output(pin, 0)
+    try:
+        if _use_wave(m3_total_steps):
+            _check_abort()
+            want = m3_total_steps
+            done = _wave_run(M3_MASKS, m3_index, -1, want, M3_SLEEP)
+            m3_index = (m3_index - done) % 8
+            m3_total_steps -= done
+            if done < want:
+                _check_abort()
+        else:
+            while m3_total_steps > 0:
+                _check_abort()
+                motor3_step_backward()
+                m3_total_steps -= 1
+    finally:
+        # turn off coils
+        GPIO.output(M3_PINS, GPIO.LOW)
 
     print("Motor3 → Home complete.")
 
@@ -208,6 +406,9 @@ def motor3_home():
 #  CLEANUP FUNCTION (optional)
 # ============================================================
 def cleanup_all():
-    ser.close()
+    with SERIAL_LOCK:
+        ser.close()
+    if _pi is not None:
+        _pi.stop()
     GPIO.cleanup()
     print("Stepper + Serial cleanup complete.")